@@ -0,0 +1,285 @@
+"""Micro-benchmarks for ETL hot paths.
+
+Run from the repo root:
+
+    python bench_etl.py ids
+    python bench_etl.py ids --sizes 10000 100000
+    python bench_etl.py csv --sizes 1000000
+    python bench_etl.py classify
+    python bench_etl.py mmap --sizes 1000000
+    python bench_etl.py dates
+    python bench_etl.py amounts
+    python bench_etl.py bloom --sizes 1000000 5000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import etl
+from utils.csv_io import pyarrow_available, read_csv
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+DESCRIPTIONS = [
+    'Digital Card Purchase - UBER TRIP HELP UBER CO',
+    'Digital Card Purchase - IZI JUAN VALDEZ CAFE J LIMA',
+    'Deposit from PAYROLL',
+    'Withdrawal to SAVINGS',
+    'AMAZON MKTPLACE PMTS',
+]
+
+
+def make_normalized(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a synthetic frame shaped like normalize_to_canonical_schema output"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'account_id': rng.choice([16, 17, 20], size=rows),
+        'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, size=rows), unit='D'),
+        'amount': np.round(rng.uniform(-500, 500, size=rows), 2),
+        'description': rng.choice(DESCRIPTIONS, size=rows),
+    })
+
+
+def timed(func):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def bench_ids(sizes, workers):
+    """Row-wise generate_transaction_id vs. batch generate_transaction_ids"""
+    print(f"{'rows':>10} {'row-wise s':>12} {'batch s':>10} {'speedup':>8}  identical")
+    for rows in sizes:
+        df = make_normalized(rows)
+
+        rowwise_s, rowwise = timed(lambda: df.apply(
+            lambda row: etl.generate_transaction_id(
+                str(row['account_id']),
+                str(row['date']),
+                float(row['amount']),
+                str(row['description'])
+            ), axis=1
+        ))
+        batch_s, batch = timed(lambda: etl.generate_transaction_ids(
+            df['account_id'], df['date'], df['amount'], df['description'], workers=workers
+        ))
+
+        identical = rowwise.tolist() == batch.tolist()
+        print(f"{rows:>10} {rowwise_s:>12.3f} {batch_s:>10.3f} {rowwise_s / batch_s:>7.1f}x  {identical}")
+
+
+def write_raw_checking(path: str, rows: int, seed: int = 42) -> None:
+    """Write a synthetic Capital One checking export (preset 11 layout)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, size=rows), unit='D')
+    pd.DataFrame({
+        'Account Number': 7729,
+        'Transaction Date': dates.strftime('%m/%d/%y'),
+        'Transaction Amount': np.round(rng.uniform(0, 500, size=rows), 2),
+        'Transaction Type': rng.choice(['Debit', 'Credit'], size=rows),
+        'Transaction Description': rng.choice(DESCRIPTIONS, size=rows),
+        'Balance': np.round(rng.uniform(-1000, 5000, size=rows), 2),
+    }).to_csv(path, index=False)
+
+
+def bench_csv(sizes):
+    """C parser vs. pyarrow for raw preset reads and the canonical table"""
+    if not pyarrow_available():
+        print("pyarrow is not installed; nothing to compare")
+        return
+
+    presets = pd.read_csv(os.path.join(etl.METADATA_DIR, "presets.csv"))
+    categories = pd.read_csv(os.path.join(etl.METADATA_DIR, "categories.csv"))
+    plan = etl.compile_presets(presets, categories, [11])[11]
+
+    print(f"{'rows':>10} {'file':>10} {'c s':>8} {'pyarrow s':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            raw_path = os.path.join(tmp, f"raw_{rows}.csv")
+            write_raw_checking(raw_path, rows)
+            canonical_path = os.path.join(tmp, f"canonical_{rows}.csv")
+            frame = make_normalized(rows)
+            frame['id'] = etl.generate_transaction_ids(
+                frame['account_id'], frame['date'], frame['amount'], frame['description'])
+            frame.to_csv(canonical_path, index=False)
+
+            cases = [
+                ('raw', lambda engine: etl.read_raw_file(raw_path, plan, engine=engine)),
+                ('canonical', lambda engine: read_csv(
+                    canonical_path, engine=engine, dtype=etl.CANONICAL_TEXT_DTYPES)),
+            ]
+            for name, read in cases:
+                c_s, _ = timed(lambda: read('c'))
+                arrow_s, _ = timed(lambda: read('pyarrow'))
+                print(f"{rows:>10} {name:>10} {c_s:>8.3f} {arrow_s:>10.3f} {c_s / arrow_s:>7.1f}x")
+
+
+def bench_classify(sizes):
+    """Row-wise type inference and dict category mapping vs. the vectorized versions"""
+    presets = pd.read_csv(os.path.join(etl.METADATA_DIR, "presets.csv"))
+    categories = pd.read_csv(os.path.join(etl.METADATA_DIR, "categories.csv"))
+    plan = etl.compile_presets(presets, categories, [14])[14]
+    names = categories['name'].tolist() + ['Unknown category']
+
+    print(f"{'rows':>10} {'step':>10} {'old s':>8} {'new s':>8} {'speedup':>8}  identical")
+    for rows in sizes:
+        rng = np.random.default_rng(42)
+        amount = pd.Series(np.round(rng.uniform(-500, 500, size=rows), 2))
+        raw_categories = pd.Series(rng.choice(names, size=rows))
+
+        cases = [
+            ('type',
+             lambda: amount.apply(lambda x: 'debit' if x < 0 else 'credit' if x > 0 else 'zero'),
+             lambda: etl.infer_transaction_type(amount)),
+            ('category',
+             lambda: raw_categories.map(dict(zip(categories['name'], categories['id']))),
+             lambda: etl.map_categories(raw_categories, plan)),
+        ]
+        for name, old, new in cases:
+            old_s, old_result = timed(old)
+            new_s, new_result = timed(new)
+            identical = old_result.astype(object).equals(new_result.astype(object))
+            print(f"{rows:>10} {name:>10} {old_s:>8.3f} {new_s:>8.3f} {old_s / new_s:>7.1f}x  {identical}")
+
+
+def bench_mmap(sizes):
+    """Buffered vs. memory-mapped raw preset reads, per available engine"""
+    presets = pd.read_csv(os.path.join(etl.METADATA_DIR, "presets.csv"))
+    categories = pd.read_csv(os.path.join(etl.METADATA_DIR, "categories.csv"))
+    plan = etl.compile_presets(presets, categories, [11])[11]
+    engines = ['c', 'pyarrow'] if pyarrow_available() else ['c']
+
+    print(f"{'rows':>10} {'engine':>8} {'read s':>8} {'mmap s':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            raw_path = os.path.join(tmp, f"raw_{rows}.csv")
+            write_raw_checking(raw_path, rows)
+            for engine in engines:
+                read_s, _ = timed(lambda: etl.read_raw_file(raw_path, plan, engine=engine))
+                mmap_s, _ = timed(lambda: etl.read_raw_file(raw_path, plan, engine=engine, memory_map=True))
+                print(f"{rows:>10} {engine:>8} {read_s:>8.3f} {mmap_s:>8.3f} {read_s / mmap_s:>7.1f}x")
+
+
+def bench_dates(sizes):
+    """Full-column pd.to_datetime vs. parse_dates over distinct values"""
+    presets = pd.read_csv(os.path.join(etl.METADATA_DIR, "presets.csv"))
+    categories = pd.read_csv(os.path.join(etl.METADATA_DIR, "categories.csv"))
+    plan = etl.compile_presets(presets, categories, [11])[11]
+
+    print(f"{'rows':>10} {'old s':>8} {'new s':>8} {'speedup':>8}  identical")
+    for rows in sizes:
+        rng = np.random.default_rng(42)
+        dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, size=rows), unit='D')
+        raw = pd.Series(dates.strftime(plan.date_format))
+
+        old_s, old = timed(lambda: pd.to_datetime(raw, format=plan.date_format, errors='coerce'))
+        new_s, new = timed(lambda: etl.parse_dates(raw, plan))
+        print(f"{rows:>10} {old_s:>8.3f} {new_s:>8.3f} {old_s / new_s:>7.1f}x  {old.equals(new)}")
+
+
+def bench_amounts(sizes):
+    """pd.to_numeric(...).fillna(0) vs. parse_money on formatted money strings"""
+    print(f"{'rows':>10} {'old s':>8} {'new s':>8} {'old zeroed':>11} {'new unparsed':>13}")
+    for rows in sizes:
+        rng = np.random.default_rng(42)
+        values = np.round(rng.uniform(-5000, 5000, size=rows), 2)
+        styles = rng.integers(0, 4, size=rows)
+        formatted = np.where(
+            styles == 0, [f"{v:.2f}" for v in values],
+            np.where(styles == 1, [f"${abs(v):,.2f}" if v >= 0 else f"(${abs(v):,.2f})" for v in values],
+                     np.where(styles == 2, [f"{abs(v):.2f} {'CR' if v >= 0 else 'DR'}" for v in values],
+                              [f"{v:,.2f}" for v in values])))
+        raw = pd.Series(formatted, dtype=object)
+
+        old_s, old = timed(lambda: pd.to_numeric(raw, errors='coerce').fillna(0))
+        new_s, new = timed(lambda: etl.parse_money(raw))
+        zeroed = int(((old == 0) & (values != 0)).sum())
+        print(f"{rows:>10} {old_s:>8.3f} {new_s:>8.3f} {zeroed:>11} {int(new.isna().sum()):>13}")
+
+
+def bench_bloom(sizes, delta_rows):
+    """Exact id set vs. the persisted Bloom filter for a delta of new transactions"""
+    print(f"{'history':>10} {'delta':>8} {'set s':>8} {'bloom s':>8} {'speedup':>8} {'stored':>7}  identical")
+    for rows in sizes:
+        history = make_normalized(rows)
+        # Stored ids are read as strings, like the canonical table's id column
+        stored = etl.generate_transaction_ids(
+            history['account_id'], history['date'], history['amount'], history['description']).astype(str)
+        # Statements after the stored history, as in a routine incremental run
+        delta = make_normalized(delta_rows, seed=7)
+        delta['date'] += pd.Timedelta(days=2000)
+        incoming = etl.generate_transaction_ids(
+            delta['account_id'], delta['date'], delta['amount'], delta['description']).tolist()
+        bloom = etl.IdBloomFilter.build(stored.tolist())
+
+        def exact():
+            index = set(stored)
+            return np.array([tx_id not in index for tx_id in incoming])
+
+        def filtered():
+            # Probable hits (false positives here) are confirmed by scanning the column
+            is_new = ~bloom.might_contain(incoming)
+            probable = np.flatnonzero(~is_new)
+            if len(probable):
+                probable_ids = [incoming[i] for i in probable]
+                found = set(stored[stored.isin(probable_ids)])
+                is_new[probable] = [tx_id not in found for tx_id in probable_ids]
+            return is_new
+
+        set_s, old = timed(exact)
+        bloom_s, new = timed(filtered)
+        print(f"{rows:>10} {delta_rows:>8} {set_s:>8.3f} {bloom_s:>8.3f} {set_s / bloom_s:>7.1f}x "
+              f"{int((~new).sum()):>7}  {(old == new).all()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ETL micro-benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    ids_parser = subparsers.add_parser('ids', help="transaction ID generation")
+    ids_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    ids_parser.add_argument('--workers', type=int, default=1)
+
+    csv_parser = subparsers.add_parser('csv', help="C parser vs. pyarrow CSV reads")
+    csv_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+
+    classify_parser = subparsers.add_parser('classify', help="transaction type inference and category mapping")
+    classify_parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000])
+
+    mmap_parser = subparsers.add_parser('mmap', help="buffered vs. memory-mapped raw reads")
+    mmap_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+
+    dates_parser = subparsers.add_parser('dates', help="date column parsing")
+    dates_parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000])
+
+    amounts_parser = subparsers.add_parser('amounts', help="money string parsing")
+    amounts_parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000])
+
+    bloom_parser = subparsers.add_parser('bloom', help="stored-id membership checks")
+    bloom_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    bloom_parser.add_argument('--delta-rows', type=int, default=10_000)
+
+    args = parser.parse_args()
+    if args.benchmark == 'ids':
+        bench_ids(args.sizes, args.workers)
+    elif args.benchmark == 'csv':
+        bench_csv(args.sizes)
+    elif args.benchmark == 'classify':
+        bench_classify(args.sizes)
+    elif args.benchmark == 'mmap':
+        bench_mmap(args.sizes)
+    elif args.benchmark == 'dates':
+        bench_dates(args.sizes)
+    elif args.benchmark == 'amounts':
+        bench_amounts(args.sizes)
+    elif args.benchmark == 'bloom':
+        bench_bloom(args.sizes, args.delta_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,26 @@
 import os
+import argparse
+import csv
+import itertools
+import asyncio
 import pandas as pd
 import logging
 import json
 import hashlib
+import time
+import uuid
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Iterator, Optional, List, Tuple, Union
+
+from utils.atomic_io import atomic_write
+from utils.csv_io import CSV_ENGINES, open_raw, open_text, read_csv
+from utils.id_filter import BLOOM_MIN_CAPACITY, IdBloomFilter, table_signature
+from utils.log_setup import start_logging, worker_logging
+from utils.manifest import IngestionManifest, RunCheckpoint
+from utils.run_report import RunReport, StageRecorder
+from utils.watcher import WATCH_DEBOUNCE, RawDirWatcher
 
 # === Paths ===
 BASE_DIR = "data"
@@ -13,17 +29,40 @@ PROCESSED_DIR = os.path.join(BASE_DIR, "processed")
 METADATA_DIR = os.path.join(BASE_DIR, "metadata")
 LOG_FILE = os.path.join(BASE_DIR, "logs/etl.log")
 
+# etl.log rotates at this size, keeping this many old files
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
 # Canonical transactions file
 TRANSACTIONS_FILE = os.path.join(PROCESSED_DIR, "transactions.csv")
 
-# === Configure logging ===
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-logging.basicConfig(
-    filename=LOG_FILE,
-    filemode="a",
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    level=logging.INFO,
-)
+# Raw statement files the ETL reads: plain or compressed CSV
+RAW_FILE_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst', '.zip')
+
+# Record of raw files already ingested
+MANIFEST_FILE = os.path.join(PROCESSED_DIR, "manifest.json")
+
+# Bloom filter over stored ids, saved next to the table
+BLOOM_SUFFIX = ".bloom.npz"
+
+# Probable hits per run checked by scanning the id column before the exact id index is built
+BLOOM_SCAN_MAX_IDS = 1000
+
+# Progress of the current/last run, used to resume after a failure
+CHECKPOINT_FILE = os.path.join(PROCESSED_DIR, "checkpoint.json")
+
+# Default seconds between intermediate commits during a run
+CHECKPOINT_INTERVAL = 60
+
+# Staged pipeline: items each inter-stage queue holds before its producer waits
+PIPELINE_QUEUE_SIZE = 2
+
+# Streaming reads: parsed row size relative to its bytes on disk, and the smallest chunk
+PARSED_ROW_EXPANSION = 6
+MIN_CHUNK_ROWS = 1000
+
+# Per-run JSON reports of stage timings and throughput
+REPORT_DIR = os.path.dirname(LOG_FILE)
 
 # === Canonical Schema ===
 CANONICAL_COLUMNS = [
@@ -31,6 +70,11 @@ CANONICAL_COLUMNS = [
     'account_id', 'category_id', 'transaction_type'
 ]
 
+# Canonical columns that must stay text when transactions.csv is read back
+CANONICAL_TEXT_DTYPES = {
+    'id': str, 'description': str, 'created_at': str, 'updated_at': str, 'transaction_type': str
+}
+
 # === Load metadata ===
 def load_metadata():
     """Load all metadata tables"""
@@ -51,115 +95,472 @@ def generate_transaction_id(account_id: str, date: str, amount: float, descripti
     return hashlib.md5(id_string.encode()).hexdigest()[:12]
 
 
-def parse_amount_processing(amount_processing_str: str) -> Dict:
-    """Parse the JSON amount_processing field from preset"""
+def _format_unique(values: pd.Series, formatter: Callable) -> np.ndarray:
+    """Format each distinct value once and broadcast back to every row"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    formatted = np.array([formatter(v) for v in uniques], dtype=object)
+    return formatted[codes]
+
+
+def _hash_keys(keys: np.ndarray) -> List[str]:
+    """MD5 a block of ID strings, truncated like generate_transaction_id"""
+    md5 = hashlib.md5
+    return [md5(key.encode()).hexdigest()[:12] for key in keys]
+
+
+def generate_transaction_ids(account_ids: pd.Series, dates: pd.Series, amounts: pd.Series,
+                             descriptions: pd.Series, workers: int = 1) -> pd.Series:
+    """Generate deterministic transaction IDs for whole columns at once"""
+    amount_keys = _format_unique(amounts, lambda v: str(float(v)))
+    # factorize treats -0.0 as 0.0, but the row-wise key keeps the sign
+    amount_values = np.asarray(amounts, dtype=float)
+    amount_keys[(amount_values == 0) & np.signbit(amount_values)] = '-0.0'
+    
+    keys = (
+        _format_unique(account_ids, str) + '_' +
+        _format_unique(dates, str) + '_' +
+        amount_keys + '_' +
+        _format_unique(descriptions, str)
+    )
+
+    if workers > 1 and len(keys) > workers:
+        blocks = np.array_split(keys, workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            ids = [tx_id for block in executor.map(_hash_keys, blocks) for tx_id in block]
+    else:
+        ids = _hash_keys(keys)
+
+    return pd.Series(ids, index=account_ids.index, dtype=object)
+
+
+class PresetError(ValueError):
+    """Raised when a preset row cannot be compiled into a normalization plan"""
+
+
+def _preset_value(preset: pd.Series, field: str, default=None):
+    """Read an optional preset field, mapping blanks/NaN to the default"""
+    value = preset.get(field, default)
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return default
+    if isinstance(value, str) and not value.strip():
+        return default
+    return value
+
+
+def _preset_json(preset: pd.Series, field: str, expected: type):
+    """Parse a JSON preset field strictly, raising PresetError when malformed"""
+    raw = _preset_value(preset, field)
+    if raw is None:
+        return expected()
     try:
-        if pd.isna(amount_processing_str) or not amount_processing_str:
-            return {}
-        return json.loads(amount_processing_str)
+        value = json.loads(raw) if isinstance(raw, str) else raw
     except json.JSONDecodeError as e:
-        logging.warning(f"Failed to parse amount_processing: {e}")
-        return {}
+        raise PresetError(f"Preset {preset.get('id')}: invalid JSON in {field}: {e}") from e
+    if not isinstance(value, expected):
+        raise PresetError(f"Preset {preset.get('id')}: {field} must be a JSON {expected.__name__}")
+    return value
 
 
-def parse_amount_columns(amount_columns_str: str) -> List[str]:
-    """Parse the JSON amount_columns field from preset"""
+def _preset_number(value, preset_id, field: str) -> float:
+    """Validate a numeric preset setting"""
     try:
-        if pd.isna(amount_columns_str) or not amount_columns_str:
-            return []
-        return json.loads(amount_columns_str)
-    except json.JSONDecodeError as e:
-        logging.warning(f"Failed to parse amount_columns: {e}")
-        return []
+        return float(value)
+    except (TypeError, ValueError) as e:
+        raise PresetError(f"Preset {preset_id}: {field} must be numeric, got {value!r}") from e
 
 
-def process_amount_with_preset(df: pd.DataFrame, preset: pd.Series) -> pd.DataFrame:
-    """Process amount based on preset configuration"""
-    df = df.copy()
+class PresetPlan:
+    """A preset row compiled once per run into everything normalization needs"""
+
+    def __init__(self, preset: pd.Series, categories: pd.DataFrame):
+        self.preset_id = preset.get('id')
+        self.name = _preset_value(preset, 'name', self.preset_id)
+
+        # CSV options
+        self.delimiter = _preset_value(preset, 'delimiter', ',')
+        self.has_header = bool(_preset_value(preset, 'has_header', True))
+        self.skip_rows = int(_preset_number(_preset_value(preset, 'skip_rows', 0), self.preset_id, 'skip_rows'))
+
+        # Column mapping
+        self.date_column = _preset_value(preset, 'date_column')
+        self.date_format = _preset_value(preset, 'date_format')
+        self.description_column = _preset_value(preset, 'description_column')
+        self.transaction_type_column = _preset_value(preset, 'transaction_type_column')
+        self.category_column = _preset_value(preset, 'category_column')
+
+        # Amount handling
+        self.amount_columns = _preset_json(preset, 'amount_columns', list)
+        self.amount_processing = _preset_json(preset, 'amount_processing', dict)
+        processing = self.amount_processing
+        if 'debit_column' in processing and 'credit_column' in processing:
+            self.amount_mode = 'debit_credit'
+            self.debit_column = processing['debit_column']
+            self.credit_column = processing['credit_column']
+            self.debit_multiplier = _preset_number(
+                processing.get('debit_multiplier', 1), self.preset_id, 'debit_multiplier')
+            self.credit_multiplier = _preset_number(
+                processing.get('credit_multiplier', -1), self.preset_id, 'credit_multiplier')
+        elif 'amount_column' in processing:
+            self.amount_mode = 'typed'
+            self.amount_column = processing['amount_column']
+            self.amount_type_column = processing.get('transaction_type_column')
+            self.debit_values = processing.get('debit_values', [])
+            self.credit_values = processing.get('credit_values', [])
+            if not isinstance(self.debit_values, list) or not isinstance(self.credit_values, list):
+                raise PresetError(f"Preset {self.preset_id}: debit_values/credit_values must be lists")
+            self.typed_multiplier = _preset_number(
+                processing.get('amount_multiplier', 1), self.preset_id, 'amount_multiplier')
+        elif self.amount_columns:
+            self.amount_mode = 'simple'
+            self.amount_column = self.amount_columns[0]
+            multiplier = _preset_value(preset, 'amount_multiplier')
+            self.amount_multiplier = (
+                _preset_number(multiplier, self.preset_id, 'amount_multiplier') if multiplier is not None else None
+            )
+        else:
+            self.amount_mode = None
+
+        # Category name -> id lookup as parallel arrays; the last duplicate name wins
+        if self.category_column:
+            lookup = categories[['name', 'id']].drop_duplicates('name', keep='last')
+            self.category_names = pd.Index(lookup['name'])
+            self.category_ids = lookup['id'].to_numpy()
+        else:
+            self.category_names = pd.Index([])
+            self.category_ids = np.array([])
+
+        self.usecols, self.dtypes = self._read_projection()
+        self.header_fingerprint = self._header_fingerprint()
+
+    def _read_projection(self) -> Tuple[Optional[frozenset], Dict[str, type]]:
+        """Columns a raw read needs and explicit dtypes for the text ones"""
+        text_columns = {
+            self.date_column or 'date',
+            self.description_column or 'description',
+            self.transaction_type_column or 'transaction_type',
+        }
+        if self.category_column:
+            text_columns.add(self.category_column)
+        amount_columns = set(self.amount_columns) if self.amount_columns else {'amount'}
+        if self.amount_mode == 'debit_credit':
+            amount_columns |= {self.debit_column, self.credit_column}
+        elif self.amount_mode in ('typed', 'simple'):
+            amount_columns.add(self.amount_column)
+        if self.amount_mode == 'typed' and self.amount_type_column:
+            text_columns.add(self.amount_type_column)
+        text_columns -= amount_columns
+
+        if not self.has_header:
+            return None, {}
+        return frozenset(text_columns | amount_columns), {column: str for column in text_columns}
+
+    def _header_fingerprint(self) -> Optional[frozenset]:
+        """Columns a file's header must contain for this preset to read it"""
+        if not self.has_header:
+            return None
+        required = {self.date_column, self.description_column}
+        if self.amount_mode == 'debit_credit':
+            required |= {self.debit_column, self.credit_column}
+        elif self.amount_mode in ('typed', 'simple'):
+            required.add(self.amount_column)
+        if self.amount_mode == 'typed':
+            required.add(self.amount_type_column)
+        required.discard(None)
+        return frozenset(required) or None
+
+    def matches_header(self, lines: Tuple[str, ...]) -> bool:
+        """Whether the header row among a file's first lines has every fingerprint column"""
+        if self.header_fingerprint is None or len(lines) <= self.skip_rows:
+            return False
+        return self.header_fingerprint <= set(header_columns(lines[self.skip_rows], self.delimiter))
+
+
+class UnknownLayoutError(ValueError):
+    """A raw file's header matches none of the import presets"""
+
+
+def header_columns(line: str, delimiter: str = ',') -> List[str]:
+    """Split a header line into column names the way pandas reads them"""
+    columns = next(csv.reader([line], delimiter=delimiter), [])
+    if columns:
+        columns[0] = columns[0].lstrip('\ufeff')
+    return columns
+
+
+class PresetIndex(dict):
+    """Compiled presets keyed by id that can route a raw file to its preset"""
+
+    def __init__(self, plans: Optional[Dict] = None):
+        super().__init__(plans or {})
+        # (default preset id, first lines) -> matching preset id, or None
+        self._routes: Dict[Tuple, Optional[int]] = {}
+
+    def header_lines(self, filepath: str) -> Tuple[str, ...]:
+        """The first lines of a file, enough to reach every preset's header row"""
+        count = 1 + max((plan.skip_rows for plan in self.values() if plan.header_fingerprint), default=0)
+        with open_text(filepath) as f:
+            return tuple(line.rstrip('\r\n') for line in itertools.islice(f, count))
+
+    def _match(self, lines: Tuple[str, ...], default: Optional[PresetPlan]) -> Optional[int]:
+        if default is not None and default.matches_header(lines):
+            return default.preset_id
+        # Otherwise the preset requiring the most columns wins
+        candidates = sorted(
+            (plan for plan in self.values() if plan.header_fingerprint and plan is not default),
+            key=lambda plan: (-len(plan.header_fingerprint), plan.preset_id)
+        )
+        for plan in candidates:
+            if plan.matches_header(lines):
+                return plan.preset_id
+        return None
+
+    def route(self, filepath: str, default: Optional[PresetPlan]) -> Optional[PresetPlan]:
+        """Return the preset whose header fingerprint matches a file, or raise UnknownLayoutError"""
+        if default is not None and default.header_fingerprint is None:
+            return default
+        lines = self.header_lines(filepath)
+        key = (default.preset_id if default is not None else None, lines)
+        if key not in self._routes:
+            self._routes[key] = self._match(lines, default)
+            preset_id = self._routes[key]
+            if preset_id is not None and default is not None and preset_id != default.preset_id:
+                logging.info(
+                    f"Header of {os.path.basename(filepath)} matches preset {self[preset_id].name}, "
+                    f"not the account default {default.name}"
+                )
+        
+        preset_id = self._routes[key]
+        if preset_id is not None:
+            return self[preset_id]
+        if default is None:
+            return None
+        columns = header_columns(lines[default.skip_rows], default.delimiter) if len(lines) > default.skip_rows else []
+        raise UnknownLayoutError(
+            f"header matches no import preset (expected {sorted(default.header_fingerprint)} "
+            f"for {default.name}, found {columns})"
+        )
+
+
+def compile_presets(presets: pd.DataFrame, categories: pd.DataFrame,
+                    preset_ids: Optional[List] = None, strict: bool = True) -> PresetIndex:
+    """Compile presets into plans keyed by preset id, failing fast on bad rows"""
+    plans = PresetIndex()
+    for _, preset in presets.iterrows():
+        if preset_ids is not None and preset['id'] not in preset_ids:
+            continue
+        try:
+            plans[preset['id']] = PresetPlan(preset, categories)
+        except PresetError as e:
+            if not strict:
+                logging.warning(f"Skipping preset: {e}")
+                continue
+            logging.error(str(e))
+            raise
+    return plans
+
+
+# Upper-cased money strings: sign or parentheses, currency symbol, thousands separators, CR/DR
+MONEY_PATTERN = (
+    r'[-+(]?\s*[$€£]?\s*[-+(]?\s*'
+    r'(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?|\.\d+)'
+    r'\s*\)?\s*(?:CR|DR|-)?'
+)
+
+# Upper-cased cell values that count as an empty amount
+MONEY_PLACEHOLDER = '[-\u2013\u2014]+|N/?A'
+
+
+def parse_money(values: pd.Series) -> pd.Series:
+    """Parse an amount column to floats, leaving unparseable values as NaN"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float).fillna(0)
+    present = values.notna()
+    codes, uniques = pd.factorize(values[present].astype(str).str.strip().str.upper())
+    distinct = pd.Series(uniques)
     
-    amount_columns = parse_amount_columns(preset.get('amount_columns', '[]'))
-    amount_processing = parse_amount_processing(preset.get('amount_processing', '{}'))
+    opened = distinct.str.contains('(', regex=False)
+    valid = distinct.str.fullmatch(MONEY_PATTERN) & (opened == distinct.str.contains(')', regex=False))
+    negative = opened | distinct.str.contains('-', regex=False) | distinct.str.endswith('DR')
+    number = pd.to_numeric(distinct.str.replace(r'[^0-9.]+', '', regex=True), errors='coerce')
+    parsed = number.where(valid) * np.where(negative, -1.0, 1.0)
+    parsed[(distinct == '') | distinct.str.fullmatch(MONEY_PLACEHOLDER)] = 0.0
     
-    if not amount_columns:
+    amounts = pd.Series(0.0, index=values.index)
+    amounts[present] = parsed.to_numpy()[codes]
+    return amounts
+
+
+def compute_amount(df: pd.DataFrame, preset: Union[pd.Series, PresetPlan]) -> pd.Series:
+    """Compute the signed amount column from a preset without copying the frame"""
+    plan = preset if isinstance(preset, PresetPlan) else PresetPlan(preset, pd.DataFrame(columns=['name', 'id']))
+    
+    if not plan.amount_columns:
         logging.warning("No amount_columns found in preset")
-        return df
+        return df['amount']
     
     # Handle different amount processing types
-    if 'debit_column' in amount_processing and 'credit_column' in amount_processing:
+    if plan.amount_mode == 'debit_credit':
         # Separate debit/credit columns (e.g., Capital One Credit Card)
-        debit_col = amount_processing['debit_column']
-        credit_col = amount_processing['credit_column']
-        debit_mult = amount_processing.get('debit_multiplier', 1)
-        credit_mult = amount_processing.get('credit_multiplier', -1)
-        
         # Convert to numeric, treating empty/null as 0
-        df[debit_col] = pd.to_numeric(df[debit_col], errors='coerce').fillna(0)
-        df[credit_col] = pd.to_numeric(df[credit_col], errors='coerce').fillna(0)
+        debit = parse_money(df[plan.debit_column])
+        credit = parse_money(df[plan.credit_column])
         
-        df['amount'] = (df[debit_col] * debit_mult) + (df[credit_col] * credit_mult)
+        # Junk in either column leaves the row without an amount
+        return (debit * plan.debit_multiplier) + (credit * plan.credit_multiplier)
         
-    elif 'amount_column' in amount_processing:
+    elif plan.amount_mode == 'typed':
         # Single amount column with transaction type (e.g., Capital One Checking)
-        amount_col = amount_processing['amount_column']
-        type_col = amount_processing.get('transaction_type_column')
-        debit_values = amount_processing.get('debit_values', [])
-        credit_values = amount_processing.get('credit_values', [])
-        
-        df['amount'] = pd.to_numeric(df[amount_col], errors='coerce').fillna(0)
+        amount = parse_money(df[plan.amount_column])
         
         # Apply sign based on transaction type
+        type_col = plan.amount_type_column
         if type_col and type_col in df.columns:
             # Debit = negative, Credit = positive (or use multiplier)
-            multiplier = amount_processing.get('amount_multiplier', 1)
-            mask_debit = df[type_col].isin(debit_values)
-            df.loc[mask_debit, 'amount'] = df.loc[mask_debit, 'amount'] * -1 * multiplier
-            df.loc[~mask_debit, 'amount'] = df.loc[~mask_debit, 'amount'] * multiplier
+            multiplier = plan.typed_multiplier
+            mask_debit = df[type_col].isin(plan.debit_values)
+            # The type sets the sign, not markers like (7.00) or 7.00 DR
+            amount = amount.abs()
+            amount = amount.where(~mask_debit, amount * -1 * multiplier).where(mask_debit, amount * multiplier)
+        return amount
     
     else:
         # Simple case - just use first amount column
-        amount_col = amount_columns[0]
-        df['amount'] = pd.to_numeric(df[amount_col], errors='coerce').fillna(0)
+        amount = parse_money(df[plan.amount_column])
         
         # Apply multiplier if specified
-        multiplier = preset.get('amount_multiplier', 1)
-        if pd.notna(multiplier):
-            df['amount'] = df['amount'] * multiplier
-    
+        if plan.amount_multiplier is not None:
+            amount = amount * plan.amount_multiplier
+        return amount
+
+
+def process_amount_with_preset(df: pd.DataFrame, preset: Union[pd.Series, PresetPlan]) -> pd.DataFrame:
+    """Process amount based on preset configuration"""
+    df = df.copy()
+    df['amount'] = compute_amount(df, preset)
     return df
 
 
-def normalize_to_canonical_schema(df: pd.DataFrame, account_row: pd.Series, preset: Optional[pd.Series], categories: pd.DataFrame) -> pd.DataFrame:
+# Labels indexed by np.sign(amount) + 1
+TRANSACTION_TYPE_LABELS = np.array(['debit', 'zero', 'credit'], dtype=object)
+
+
+def infer_transaction_type(amount: pd.Series) -> pd.Series:
+    """Classify amounts as debit/credit/zero by sign over the whole column"""
+    signs = np.sign(np.nan_to_num(amount.to_numpy(dtype=float)))
+    return pd.Series(TRANSACTION_TYPE_LABELS[(signs + 1).astype(np.intp)], index=amount.index, dtype=object)
+
+
+def map_categories(values: pd.Series, plan: PresetPlan) -> pd.Series:
+    """Map raw category names to category ids via categorical codes"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    positions = plan.category_names.get_indexer(uniques)
+    if (positions >= 0).all():
+        return pd.Series(plan.category_ids[positions][codes], index=values.index)
+    matched = positions >= 0
+    category_ids = np.full(len(positions), np.nan)
+    category_ids[matched] = plan.category_ids[positions[matched]]
+    return pd.Series(category_ids[codes], index=values.index)
+
+
+# Formats tried, after a preset's own, when a file's dates don't match it
+DATE_FORMATS = ['%m/%d/%y', '%m/%d/%Y', '%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%d/%m/%y', '%Y-%m-%d %H:%M:%S']
+
+# (preset id, preset date_format) -> fallback format that last parsed a whole file
+_date_format_cache: Dict[Tuple, str] = {}
+
+
+def _parse_distinct(uniques: pd.Index, date_format: Optional[str]) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(uniques, format=date_format, errors='coerce'))
+
+
+def _day_month_order(date_format: str) -> Optional[str]:
+    """'md' for month-first formats, 'dm' for day-first ones, None if the year leads or a field is missing"""
+    day, month = date_format.find('%d'), date_format.find('%m')
+    if day < 0 or month < 0:
+        return None
+    year = max(date_format.find('%Y'), date_format.find('%y'))
+    if 0 <= year < min(day, month):
+        return None
+    return 'dm' if day < month else 'md'
+
+
+def parse_dates(values: pd.Series, plan: Optional[PresetPlan] = None,
+                date_format: Optional[str] = None) -> pd.Series:
+    """Parse a date column by converting each distinct string once"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    
+    parsed = None
+    if plan is not None and plan.date_format is not None:
+        key = (plan.preset_id, plan.date_format)
+        cached = _date_format_cache.get(key)
+        order = _day_month_order(plan.date_format)
+        candidates = [
+            f for f in dict.fromkeys(f for f in (plan.date_format, cached, *DATE_FORMATS) if f is not None)
+            if f == plan.date_format or order is None or _day_month_order(f) in (None, order)
+        ]
+        fallback = None
+        for candidate in candidates:
+            try:
+                attempt = _parse_distinct(uniques, candidate)
+            except ValueError:
+                # Malformed format string in the preset
+                continue
+            if candidate == plan.date_format:
+                fallback = attempt
+            if not attempt.isna().any():
+                parsed = attempt
+                if candidate != plan.date_format and candidate != cached:
+                    _date_format_cache[key] = candidate
+                    logging.info(
+                        f"Dates for preset {plan.preset_id} match '{candidate}', "
+                        f"not the preset's '{plan.date_format}'"
+                    )
+                break
+        if parsed is None:
+            parsed = fallback
+            if fallback is not None:
+                logging.warning(
+                    f"{int(fallback.isna().sum())} distinct dates don't match preset {plan.preset_id}'s "
+                    f"'{plan.date_format}', e.g. {list(uniques[fallback.isna()][:3])}"
+                )
+    if parsed is None:
+        parsed = _parse_distinct(uniques, date_format)
+    
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=values.index)
+
+
+def normalize_to_canonical_schema(df: pd.DataFrame, account_row: pd.Series,
+                                  preset: Optional[Union[pd.Series, PresetPlan]],
+                                  categories: pd.DataFrame,
+                                  recorder: Optional[StageRecorder] = None) -> pd.DataFrame:
     """Transform raw data to canonical schema"""
+    plan = preset
+    if preset is not None and not isinstance(preset, PresetPlan):
+        plan = PresetPlan(preset, categories)
     normalized = pd.DataFrame()
     
     # Date parsing
-    if preset is not None and 'date_column' in preset and pd.notna(preset['date_column']):
-        date_col = preset['date_column']
-        date_format = preset.get('date_format')
+    if plan is not None and plan.date_column is not None:
+        date_col = plan.date_column
         
         if date_col in df.columns:
-            try:
-                if pd.notna(date_format):
-                    normalized['date'] = pd.to_datetime(df[date_col], format=date_format, errors='coerce')
-                else:
-                    normalized['date'] = pd.to_datetime(df[date_col], errors='coerce')
-            except Exception as e:
-                logging.warning(f"Date parsing failed: {e}")
-                normalized['date'] = pd.to_datetime(df[date_col], errors='coerce')
+            normalized['date'] = parse_dates(df[date_col], plan)
         else:
             logging.error(f"Date column '{date_col}' not found in data")
             return pd.DataFrame()
     else:
         # Fallback to 'date' column
         if 'date' in df.columns:
-            normalized['date'] = pd.to_datetime(df['date'], errors='coerce')
+            normalized['date'] = parse_dates(df['date'])
         else:
             logging.error("No date column found")
             return pd.DataFrame()
     
     # Description
-    if preset is not None and 'description_column' in preset and pd.notna(preset['description_column']):
-        desc_col = preset['description_column']
+    if plan is not None and plan.description_column is not None:
+        desc_col = plan.description_column
         if desc_col in df.columns:
             normalized['description'] = df[desc_col].astype(str).fillna('')
         else:
@@ -170,19 +571,31 @@ def normalize_to_canonical_schema(df: pd.DataFrame, account_row: pd.Series, pres
         normalized['description'] = ''
     
     # Amount processing
-    if preset is not None:
-        df_with_amount = process_amount_with_preset(df, preset)
-        normalized['amount'] = df_with_amount['amount']
+    if plan is not None:
+        normalized['amount'] = compute_amount(df, plan)
     else:
         # Fallback amount processing
         if 'amount' in df.columns:
-            normalized['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0)
+            normalized['amount'] = parse_money(df['amount'])
         else:
             normalized['amount'] = 0
     
+    # Rows whose amount isn't money are dropped below, not zeroed
+    unparseable = normalized['amount'].isna()
+    if unparseable.any():
+        amount_columns = [
+            col for col in (plan.amount_columns if plan is not None and plan.amount_columns else ['amount'])
+            if col in df.columns
+        ]
+        examples = df.loc[unparseable, amount_columns].head(3).to_dict('records')
+        source = f" in {recorder.filename}" if recorder is not None and recorder.filename else ""
+        logging.warning(f"Dropping {int(unparseable.sum())} rows with unparseable amounts{source}, e.g. {examples}")
+        if recorder is not None:
+            recorder.count('normalize', 'unparseable_amounts', int(unparseable.sum()))
+    
     # Transaction type
-    if preset is not None and 'transaction_type_column' in preset and pd.notna(preset['transaction_type_column']):
-        type_col = preset['transaction_type_column']
+    if plan is not None and plan.transaction_type_column is not None:
+        type_col = plan.transaction_type_column
         if type_col in df.columns:
             normalized['transaction_type'] = df[type_col].astype(str).fillna('')
         else:
@@ -191,21 +604,18 @@ def normalize_to_canonical_schema(df: pd.DataFrame, account_row: pd.Series, pres
         normalized['transaction_type'] = df['transaction_type'].astype(str).fillna('')
     else:
         # Infer from amount
-        normalized['transaction_type'] = normalized['amount'].apply(
-            lambda x: 'debit' if x < 0 else 'credit' if x > 0 else 'zero'
-        )
+        normalized['transaction_type'] = infer_transaction_type(normalized['amount'])
     
     # Account ID
     normalized['account_id'] = account_row['id']
     
     # Category matching
     normalized['category_id'] = None
-    if preset is not None and 'category_column' in preset and pd.notna(preset['category_column']):
-        cat_col = preset['category_column']
+    if plan is not None and plan.category_column is not None:
+        cat_col = plan.category_column
         if cat_col in df.columns:
             # Simple category name matching
-            cat_lookup = dict(zip(categories['name'], categories['id']))
-            normalized['category_id'] = df[cat_col].map(cat_lookup)
+            normalized['category_id'] = map_categories(df[cat_col], plan)
     
     # Timestamps
     now = datetime.now().isoformat()
@@ -213,14 +623,15 @@ def normalize_to_canonical_schema(df: pd.DataFrame, account_row: pd.Series, pres
     normalized['updated_at'] = now
     
     # Generate IDs
-    normalized['id'] = normalized.apply(
-        lambda row: generate_transaction_id(
-            str(row['account_id']), 
-            str(row['date']), 
-            float(row['amount']), 
-            str(row['description'])
-        ), axis=1
-    )
+    recorder = recorder if recorder is not None else StageRecorder()
+    with recorder.stage('id_hash', rows_in=len(normalized)) as record:
+        normalized['id'] = generate_transaction_ids(
+            normalized['account_id'],
+            normalized['date'],
+            normalized['amount'],
+            normalized['description'],
+        )
+        record['rows_out'] += len(normalized)
     
     # Ensure all canonical columns exist
     for col in CANONICAL_COLUMNS:
@@ -230,73 +641,509 @@ def normalize_to_canonical_schema(df: pd.DataFrame, account_row: pd.Series, pres
     # Reorder columns to match canonical schema
     normalized = normalized[CANONICAL_COLUMNS]
     
-    # Remove rows with invalid dates
-    normalized = normalized.dropna(subset=['date'])
+    # Remove rows with invalid dates or amounts
+    normalized = normalized.dropna(subset=['date', 'amount'])
     
     return normalized
 
 
-def delta_load_transactions(new_df: pd.DataFrame, account_id: str, accounts: pd.DataFrame) -> pd.DataFrame:
-    """Update canonical transactions.csv with delta load logic"""
+class ETLSession:
+    """Keep the canonical transactions table resident for a whole ETL run"""
+
+    def __init__(self, accounts: pd.DataFrame, transactions_file: str = TRANSACTIONS_FILE,
+                 manifest: Optional[IngestionManifest] = None, engine: Optional[str] = None,
+                 checkpoint: Optional[RunCheckpoint] = None, checkpoint_interval: Optional[float] = None,
+                 dry_run: bool = False, report: Optional[RunReport] = None, profile: bool = False):
+        self.accounts = accounts
+        self.transactions_file = transactions_file
+        self.engine = engine
+        self.manifest = manifest if manifest is not None else IngestionManifest(MANIFEST_FILE)
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.dry_run = dry_run
+        self.report = report
+        # Times the table writes across every commit of the run
+        self.recorder = StageRecorder(profile=profile)
+        self._last_commit = time.monotonic()
+        # (account_id, filepath) applied since the last commit
+        self._uncommitted_files: List[Tuple[str, str]] = []
+        self.transactions = self._load_transactions()
+        self.bloom_file = os.path.splitext(transactions_file)[0] + BLOOM_SUFFIX
+        self._bloom_dirty = False
+        self.bloom = self._load_bloom()
+        self.account_counts: Dict[str, Dict[str, int]] = {}
+        self.dirty = False
+        # Inserted rows wait here until the table is next needed as a whole
+        self._pending: List[pd.DataFrame] = []
+        # Exact hash index over stored ids, built on demand
+        self._id_index: Optional[set] = None
+        # Probable hits confirmed by column scans so far this run
+        self._scanned_ids = 0
+        # Account -> {id: file it was first read from} for files applied this run
+        self._run_ids: Dict[str, Dict[str, str]] = {}
+
+    def _load_transactions(self) -> Optional[pd.DataFrame]:
+        """Load the canonical table, or None if it does not exist yet"""
+        if not os.path.exists(self.transactions_file):
+            self._table_signature = None
+            return None
+        self._table_signature = table_signature(self.transactions_file)
+        existing_df = read_csv(self.transactions_file, engine=self.engine, dtype=CANONICAL_TEXT_DTYPES)
+        existing_df['date'] = parse_dates(existing_df['date'], date_format='ISO8601')
+        logging.info(f"Loaded {len(existing_df)} existing transactions from {self.transactions_file}")
+        return existing_df
+
+    def refresh(self) -> bool:
+        """Reload the table and id filter if transactions.csv changed on disk since it was read or written"""
+        on_disk = table_signature(self.transactions_file) if os.path.exists(self.transactions_file) else None
+        if on_disk == self._table_signature:
+            return False
+        if self.dirty or self._pending:
+            logging.warning(f"{self.transactions_file} changed on disk while uncommitted rows are pending")
+            return False
+        logging.info(f"{self.transactions_file} changed on disk; reloading it")
+        self.transactions = self._load_transactions()
+        self.bloom = self._load_bloom()
+        self._id_index = None
+        self._scanned_ids = 0
+        return True
+
+    def _load_bloom(self) -> IdBloomFilter:
+        """The saved id filter if it matches the table file, else one rebuilt from the table"""
+        if self.transactions is None:
+            return IdBloomFilter(BLOOM_MIN_CAPACITY)
+        bloom = IdBloomFilter.load(self.bloom_file)
+        if bloom is not None and bloom.table_signature == table_signature(self.transactions_file):
+            return bloom
+        
+        # Missing or stale
+        logging.info(f"Building id filter over {len(self.transactions)} stored transactions")
+        self._bloom_dirty = True
+        return IdBloomFilter.build(self.transactions['id'].tolist())
+
+    def _resolve_account(self, account_id: str) -> Optional[int]:
+        """Map an account number to its internal ID"""
+        account_row = self.accounts[self.accounts['number'] == int(account_id)]
+        if account_row.empty:
+            logging.error(f"Account {account_id} not found in accounts metadata")
+            return None
+        return account_row.iloc[0]['id']
+
+    def _ids(self) -> set:
+        """Hash index of every stored transaction id"""
+        if self._id_index is None:
+            self.flush()
+            self._id_index = set(self.transactions['id']) if self.transactions is not None else set()
+        return self._id_index
+
+    def _stored_among(self, ids: List[str]) -> set:
+        """Which of a few ids are stored, found by scanning the id column instead of indexing it"""
+        stored = set()
+        frames = [self.transactions, *self._pending] if self.transactions is not None else self._pending
+        for frame in frames:
+            column = frame['id']
+            stored.update(column[column.isin(ids)])
+        return stored
+
+    def flush(self) -> None:
+        """Fold pending inserts into the resident table"""
+        if not self._pending:
+            return
+        frames = [self.transactions, *self._pending] if self.transactions is not None else self._pending
+        self.transactions = pd.concat(frames, ignore_index=True)
+        self._pending = []
+
+    def drop_run_duplicates(self, frames: List[pd.DataFrame], account_id: str,
+                            filepath: str) -> Tuple[List[pd.DataFrame], int]:
+        """Drop rows another file of this run already supplied for the account"""
+        run_ids = self._run_ids.setdefault(str(account_id), {})
+        kept_frames = []
+        dropped = 0
+        for frame in frames:
+            ids = frame['id'].tolist()
+            is_repeat = np.fromiter(
+                (run_ids.get(tx_id, filepath) != filepath for tx_id in ids), dtype=bool, count=len(ids)
+            )
+            repeats = int(is_repeat.sum())
+            dropped += repeats
+            if repeats < len(ids):
+                kept_frames.append(frame[~is_repeat] if repeats else frame)
+        
+        for frame in kept_frames:
+            for tx_id in frame['id']:
+                run_ids.setdefault(tx_id, filepath)
+        
+        if dropped > 0:
+            logging.info(
+                f"Dropped {dropped} rows of {os.path.basename(filepath)} already read from another file "
+                f"for account {account_id}"
+            )
+        return kept_frames, dropped
+
+    def apply_delta(self, new_df: Union[pd.DataFrame, List[pd.DataFrame]], account_id: str) -> int:
+        """Upsert a file's rows by transaction id, returning rows inserted"""
+        new_frames = [new_df] if isinstance(new_df, pd.DataFrame) else list(new_df)
+        new_frames = [frame for frame in new_frames if not frame.empty]
+        if not new_frames:
+            logging.warning(f"No new data for account {account_id}")
+            return 0
+
+        if self._resolve_account(account_id) is None:
+            return 0
+
+        # Only ids the filter may hold need the exact lookup
+        frame_ids = [frame['id'].tolist() for frame in new_frames]
+        maybe_stored = [self.bloom.might_contain(ids) for ids in frame_ids]
+        probable_ids = [
+            tx_id for ids, maybe in zip(frame_ids, maybe_stored) for tx_id in itertools.compress(ids, maybe)
+        ]
+        stored = set()
+        if probable_ids:
+            self._scanned_ids += len(probable_ids)
+            if self._id_index is None and self._scanned_ids <= BLOOM_SCAN_MAX_IDS:
+                stored = self._stored_among(probable_ids)
+            else:
+                stored = self._ids()
+
+        inserted_frames = []
+        matched = 0
+        for frame, ids, maybe in zip(new_frames, frame_ids, maybe_stored):
+            is_new = ~maybe
+            probable = np.flatnonzero(maybe)
+            if len(probable):
+                is_new[probable] = [ids[i] not in stored for i in probable]
+            matched += len(ids) - int(is_new.sum())
+            if is_new.any():
+                inserted = frame[is_new] if not is_new.all() else frame
+                if not pd.api.types.is_datetime64_any_dtype(inserted['date']):
+                    inserted = inserted.assign(date=parse_dates(inserted['date']))
+                inserted_frames.append(inserted)
+
+        # Register ids only after the whole delta so in-file repeats stay
+        inserted_rows = 0
+        for frame in inserted_frames:
+            self.bloom.add(frame['id'].tolist())
+            if self._id_index is not None:
+                self._id_index.update(frame['id'])
+            inserted_rows += len(frame)
+        self._pending.extend(inserted_frames)
+
+        if matched > 0:
+            logging.info(f"Kept {matched} already stored transactions for account {account_id}")
+        if inserted_rows > 0:
+            self.dirty = True
+
+        counts = self.account_counts.setdefault(str(account_id), {'new': 0, 'matched': 0})
+        counts['new'] += inserted_rows
+        counts['matched'] += matched
+
+        logging.info(f"Inserted {inserted_rows} new rows for account {account_id}")
+        return inserted_rows
+
+    def retract(self, ids: List[str], account_id: str) -> int:
+        """Remove rows a previous ingestion of a file contributed"""
+        account_internal_id = self._resolve_account(account_id)
+        if account_internal_id is None or not ids:
+            return 0
+        self.flush()
+        if self.transactions is None:
+            return 0
+
+        mask = (self.transactions['account_id'] == account_internal_id) & self.transactions['id'].isin(ids)
+        retracted = int(mask.sum())
+        if retracted > 0:
+            self.transactions = self.transactions[~mask]
+            # The filter keeps their bits until it is next rebuilt
+            if self._id_index is not None:
+                self._id_index.difference_update(ids)
+            run_ids = self._run_ids.get(str(account_id), {})
+            for tx_id in ids:
+                run_ids.pop(tx_id, None)
+            self.dirty = True
+            logging.info(f"Retracted {retracted} transactions from a previous import for account {account_id}")
+        return retracted
+
+    def account_transactions(self, account_id: str) -> pd.DataFrame:
+        """Return the resident rows belonging to one account"""
+        account_internal_id = self._resolve_account(account_id)
+        self.flush()
+        if self.transactions is None or account_internal_id is None:
+            return pd.DataFrame(columns=CANONICAL_COLUMNS)
+        return self.transactions[self.transactions['account_id'] == account_internal_id]
+
+    def account_summary(self) -> Dict[str, Dict[str, int]]:
+        """Per-account new/matched counts for this run plus resident totals"""
+        self.flush()
+        totals = self.transactions['account_id'].value_counts() if self.transactions is not None else {}
+        summary = {}
+        for account_id, counts in self.account_counts.items():
+            account_internal_id = self._resolve_account(account_id)
+            summary[account_id] = {**counts, 'total': int(totals.get(account_internal_id, 0))}
+        return summary
+
+    def file_applied(self, account_id: str, filepath: str) -> None:
+        """Note a fully applied file and commit if the checkpoint interval has passed"""
+        self._uncommitted_files.append((str(account_id), filepath))
+        if self.checkpoint_interval is not None and time.monotonic() - self._last_commit >= self.checkpoint_interval:
+            logging.info(f"Checkpointing after {len(self._uncommitted_files)} files")
+            self.commit()
+
+    def commit(self) -> None:
+        """Durably write the table, then the manifest, then the run checkpoint"""
+        self.flush()
+        if self.dry_run:
+            if self.dirty and self.transactions is not None:
+                logging.info(f"Dry run: would commit {len(self.transactions)} transactions to {self.transactions_file}")
+            self._uncommitted_files = []
+            self._last_commit = time.monotonic()
+            return
+        if not self.dirty or self.transactions is None:
+            logging.info("No changes to commit")
+        else:
+            with self.recorder.stage('write', rows_in=len(self.transactions)) as record:
+                self.transactions = self.transactions.sort_values(['account_id', 'date']).reset_index(drop=True)
+                atomic_write(self.transactions_file, self._write_table)
+                self._table_signature = table_signature(self.transactions_file)
+                record['rows_out'] += len(self.transactions)
+            self.dirty = False
+            self._bloom_dirty = True
+            logging.info(f"Committed {len(self.transactions)} transactions to {self.transactions_file}")
+        self._save_bloom()
+
+        self.manifest.save()
+        if self.checkpoint is not None:
+            self.checkpoint.mark_committed(self._uncommitted_files)
+            self.checkpoint.save()
+        self._uncommitted_files = []
+        self._last_commit = time.monotonic()
+
+
+    def _write_table(self, path: str) -> None:
+        """Write the table and fsync it, so the rename never exposes a partial file"""
+        with open(path, 'w', newline='') as f:
+            self.transactions.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _save_bloom(self) -> None:
+        """Write the id filter for the table just committed, rebuilding it once overfull"""
+        if not self._bloom_dirty or self.transactions is None or not os.path.exists(self.transactions_file):
+            return
+        if self.bloom.full:
+            logging.info(f"Rebuilding id filter over {len(self.transactions)} transactions")
+            self.bloom = IdBloomFilter.build(self.transactions['id'].tolist())
+        self.bloom.save(self.bloom_file, table_signature(self.transactions_file))
+        self._bloom_dirty = False
+
+
+def delta_load_transactions(new_df: pd.DataFrame, account_id: str, accounts: pd.DataFrame,
+                            session: Optional[ETLSession] = None) -> pd.DataFrame:
+    """Upsert new rows into canonical transactions.csv by transaction id"""
     if new_df.empty:
         logging.warning(f"No new data for account {account_id}")
         return pd.DataFrame()
-    
-    new_df['date'] = pd.to_datetime(new_df['date'])
-    min_date, max_date = new_df['date'].min(), new_df['date'].max()
-    
-    if pd.isna(min_date) or pd.isna(max_date):
-        logging.warning(f"No valid dates in new data for account {account_id}")
-        return pd.DataFrame()
-    
-    # Get the account's internal ID from the account number
-    account_row = accounts[accounts['number'] == int(account_id)]
-    if account_row.empty:
-        logging.error(f"Account {account_id} not found in accounts metadata")
-        return pd.DataFrame()
-    
-    account_internal_id = account_row.iloc[0]['id']
-    
-    # print(f"account_id (number): {account_id}, internal_id: {account_internal_id}, date range: {min_date.date()} to {max_date.date()}")
-    
-    # Load existing transactions
-    if os.path.exists(TRANSACTIONS_FILE):
-        existing_df = pd.read_csv(TRANSACTIONS_FILE)
-        existing_df['date'] = pd.to_datetime(existing_df['date'])
+
+    owns_session = session is None
+    if owns_session:
+        session = ETLSession(accounts)
+
+    session.apply_delta(new_df, account_id)
+
+    if owns_session:
+        session.commit()
+    session.flush()
+    return session.transactions
+
+
+def estimate_row_bytes(filepath: str, sample_bytes: int = 1 << 16) -> float:
+    """Estimate the average (decompressed) size of a row from the head of a file"""
+    with open_raw(filepath) as f:
+        sample = f.read(sample_bytes)
+    return len(sample) / max(sample.count(b'\n'), 1)
+
+
+class ReadOptions:
+    """How raw files are read: parser engine, and whole vs. bounded chunks"""
+
+    def __init__(self, chunk_rows: Optional[int] = None, memory_budget_mb: Optional[float] = None,
+                 concurrency: int = 1, engine: Optional[str] = None,
+                 since: Optional[pd.Timestamp] = None, force: bool = False, profile: bool = False,
+                 memory_map: bool = False, skip_files: frozenset = frozenset()):
+        self.chunk_rows = chunk_rows
+        self.memory_budget_mb = memory_budget_mb
+        self.concurrency = max(concurrency, 1)
+        self.engine = engine
+        self.since = since
+        self.force = force
+        self.profile = profile
+        self.memory_map = memory_map
+        self.skip_files = skip_files
+
+    def chunk_rows_for(self, filepath: str) -> Optional[int]:
+        """Rows per chunk for this file, or None to read it whole"""
+        if self.chunk_rows:
+            return self.chunk_rows
+        if not self.memory_budget_mb:
+            return None
+        budget_bytes = self.memory_budget_mb * 1024 * 1024 / self.concurrency
+        rows = int(budget_bytes // (estimate_row_bytes(filepath) * PARSED_ROW_EXPANSION))
+        return max(rows, MIN_CHUNK_ROWS)
+
+    def window(self, normalized_df: pd.DataFrame) -> pd.DataFrame:
+        """Drop normalized rows dated before `since`"""
+        if self.since is None or normalized_df.empty:
+            return normalized_df
+        return normalized_df[normalized_df['date'] >= self.since]
+
+
+def check_file(filepath: str, manifest: Optional[IngestionManifest],
+               read_options: Optional[ReadOptions] = None) -> Tuple[Optional[str], Optional[Dict]]:
+    """Return a file's ingestion status and signature, or (None, None) to skip it"""
+    status, signature = 'new', None
+    if read_options is not None and filepath in read_options.skip_files:
+        logging.info(f"Skipping file committed before the run was interrupted: {os.path.basename(filepath)}")
+        return None, None
+    if manifest is not None:
+        status, signature = manifest.check(filepath)
+        if status == 'unchanged':
+            if read_options is None or not read_options.force:
+                logging.info(f"Skipping unchanged file: {os.path.basename(filepath)}")
+                return None, None
+            status = 'changed'
+    if read_options is not None and read_options.since is not None:
+        return 'new', None
+    return status, signature
+
+
+def read_raw_file(filepath: str, plan: Optional[PresetPlan], chunk_rows: Optional[int] = None,
+                  engine: Optional[str] = None,
+                  memory_map: bool = False) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """Read one raw statement file using the preset's CSV options"""
+    if plan is not None:
+        # Project to the preset's columns so unused ones are never materialized
+        return read_csv(
+            filepath,
+            engine=engine,
+            delimiter=plan.delimiter,
+            header=0 if plan.has_header else None,
+            skiprows=plan.skip_rows,
+            usecols=plan.usecols.__contains__ if plan.usecols is not None else None,
+            dtype=plan.dtypes or None,
+            chunksize=chunk_rows,
+            memory_map=memory_map
+        )
+    return read_csv(filepath, engine=engine, chunksize=chunk_rows, memory_map=memory_map)
+
+
+def read_frames(filepath: str, preset: Optional[PresetPlan], chunk_rows: Optional[int],
+                read_options: Optional[ReadOptions], recorder: StageRecorder) -> Iterator[pd.DataFrame]:
+    """Yield a raw file as one frame, or chunk by chunk, timing each read"""
+    engine = read_options.engine if read_options is not None else None
+    memory_map = read_options is not None and read_options.memory_map
+    with recorder.stage('read', bytes_read=os.path.getsize(filepath)) as record:
+        raw = read_raw_file(filepath, preset, chunk_rows, engine, memory_map)
+        if chunk_rows is None:
+            record['rows_out'] += len(raw)
+    if chunk_rows is None:
+        yield raw
+        return
+    while True:
+        with recorder.stage('read') as record:
+            raw_df = next(raw, None)
+            if raw_df is not None:
+                record['rows_out'] += len(raw_df)
+        if raw_df is None:
+            return
+        yield raw_df
+
+
+def normalize_frame(raw_df: pd.DataFrame, account_row: pd.Series, preset: Optional[PresetPlan],
+                    categories: pd.DataFrame, read_options: Optional[ReadOptions],
+                    recorder: StageRecorder) -> pd.DataFrame:
+    """Normalize one raw frame and apply the run's date window, timing it"""
+    with recorder.stage('normalize', rows_in=len(raw_df)) as record:
+        normalized_df = normalize_to_canonical_schema(raw_df, account_row, preset, categories, recorder)
+        if read_options is not None:
+            normalized_df = read_options.window(normalized_df)
+        record['rows_out'] += len(normalized_df)
+    return normalized_df
+
+
+class ExtractedFile:
+    """A raw file after read + normalize, waiting for the single writer"""
+
+    def __init__(self, filepath: str, frames: List[pd.DataFrame], status: str = 'new',
+                 signature: Optional[Dict] = None, recorder: Optional[StageRecorder] = None):
+        self.filepath = filepath
+        self.filename = os.path.basename(filepath)
+        self.frames = [frame for frame in frames if not frame.empty]
+        self.status = status
+        self.signature = signature
+        self.recorder = recorder if recorder is not None else StageRecorder(filename=self.filename)
+
+    @property
+    def rows(self) -> int:
+        return sum(len(frame) for frame in self.frames)
+
+    def ids(self) -> List[str]:
+        return [tx_id for frame in self.frames for tx_id in frame['id'].tolist()]
+
+
+def extract_file(filepath: str, account_id: str, account_row: pd.Series, preset: Optional[PresetPlan],
+                 categories: pd.DataFrame, manifest: Optional[IngestionManifest] = None,
+                 read_options: Optional[ReadOptions] = None,
+                 plans: Optional[PresetIndex] = None) -> Optional[ExtractedFile]:
+    """Read and normalize a single raw file"""
+    filename = os.path.basename(filepath)
+    try:
+        status, signature = check_file(filepath, manifest, read_options)
+        if status is None:
+            return None
         
-        print(f"existing_df account_ids: {existing_df['account_id'].unique()}")
+        # Route by header before paying for a full parse
+        if plans is not None:
+            preset = plans.route(filepath, preset)
         
-        # Remove overlapping date range for this account
-        mask = (
-            (existing_df['account_id'] == account_internal_id) & 
-            (existing_df['date'] >= min_date) & 
-            (existing_df['date'] <= max_date)
-        )
+        chunk_rows = read_options.chunk_rows_for(filepath) if read_options is not None else None
+        recorder = StageRecorder(account_id, filename, profile=read_options is not None and read_options.profile)
         
-        overlapping_count = mask.sum()
-        if overlapping_count > 0:
-            logging.info(f"Removed {overlapping_count} duplicate transactions based on date")
+        frames = []
+        raw_rows = 0
+        for raw_df in read_frames(filepath, preset, chunk_rows, read_options, recorder):
+            raw_rows += len(raw_df)
+            if raw_df.empty:
+                continue
+            # Normalize to canonical schema
+            frames.append(normalize_frame(raw_df, account_row, preset, categories, read_options, recorder))
         
-        existing_df = existing_df[~mask]
+        if raw_rows == 0:
+            logging.info(f"Skipping empty file: {filename}")
+        elif chunk_rows is not None:
+            logging.info(f"Streamed {raw_rows} rows from {filename} in chunks of {chunk_rows}")
+        return ExtractedFile(filepath, frames, status, signature, recorder)
         
-        # Combine with new data
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-    else:
-        combined_df = new_df
-    
-    # Sort by date and save
-    combined_df = combined_df.sort_values(['account_id', 'date']).reset_index(drop=True)
-    
-    # Ensure directory exists
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
-    combined_df.to_csv(TRANSACTIONS_FILE, index=False)
-    
-    logging.info(f"Updated transactions.csv with {len(new_df)} new rows for account {account_id}. Total: {len(combined_df)}")
-    
-    return combined_df
+    except Exception as e:
+        logging.error(f"Failed to process {filename} for account {account_id}: {e}")
+        return None
 
-def process_account(account_id: str, accounts: pd.DataFrame, presets: pd.DataFrame, categories: pd.DataFrame) -> Optional[pd.DataFrame]:
-    """Process all raw files for a single account"""
+
+def statement_order(extracted_file: ExtractedFile) -> Tuple:
+    """Sort key placing extracted files in statement-date order"""
+    if not extracted_file.frames:
+        return pd.Timestamp.min, pd.Timestamp.min, extracted_file.filename
+    min_date = min(frame['date'].min() for frame in extracted_file.frames)
+    max_date = max(frame['date'].max() for frame in extracted_file.frames)
+    return min_date, max_date, extracted_file.filename
+
+
+def is_raw_file(filename: str) -> bool:
+    """Whether a file in an account folder is a statement the ETL reads"""
+    return filename.endswith(RAW_FILE_SUFFIXES)
+
+
+def resolve_account(account_id: str, accounts: pd.DataFrame, presets: pd.DataFrame, categories: pd.DataFrame,
+                    plans: Optional[PresetIndex] = None) -> Optional[Tuple[pd.Series, Optional[PresetPlan]]]:
+    """Look up an account folder's metadata row and compiled import preset"""
     try:
         account_row = accounts[accounts['number'] == int(account_id)]
     except (ValueError, KeyError):
@@ -312,11 +1159,27 @@ def process_account(account_id: str, accounts: pd.DataFrame, presets: pd.DataFra
     
     # Get preset
     preset = None
-    if 'default_import_preset_id' in account_row and pd.notna(account_row['default_import_preset_id']):
-        preset_rows = presets[presets['id'] == account_row['default_import_preset_id']]
-        if not preset_rows.empty:
-            preset = preset_rows.iloc[0]
-            logging.info(f"Using preset: {preset.get('name', preset['id'])}")
+    preset_id = account_row.get('default_import_preset_id')
+    if pd.notna(preset_id):
+        if plans is None:
+            plans = compile_presets(presets, categories, [preset_id])
+        preset = plans.get(preset_id)
+        if preset is not None:
+            logging.info(f"Using preset: {preset.name}")
+    
+    return account_row, preset
+
+
+def extract_account(account_id: str, accounts: pd.DataFrame, presets: pd.DataFrame,
+                    categories: pd.DataFrame, file_workers: int = 1,
+                    manifest: Optional[IngestionManifest] = None,
+                    read_options: Optional[ReadOptions] = None,
+                    plans: Optional[PresetIndex] = None) -> Optional[List[ExtractedFile]]:
+    """Read and normalize every new or changed raw file for one account"""
+    resolved = resolve_account(account_id, accounts, presets, categories, plans)
+    if resolved is None:
+        return None
+    account_row, preset = resolved
     
     # Process raw files
     account_raw_dir = os.path.join(RAW_DIR, str(account_id))
@@ -324,87 +1187,537 @@ def process_account(account_id: str, accounts: pd.DataFrame, presets: pd.DataFra
         logging.warning(f"No raw directory for account {account_id}")
         return None
     
-    csv_files = [f for f in os.listdir(account_raw_dir) if f.endswith('.csv')]
+    csv_files = [f for f in os.listdir(account_raw_dir) if is_raw_file(f)]
     if not csv_files:
         logging.warning(f"No CSV files found for account {account_id}")
         return None
     
-    processed_count = 0
-    for filename in csv_files:
-        filepath = os.path.join(account_raw_dir, filename)
-        try:
-            # Load raw data
-            if preset is not None:
-                delimiter = preset.get('delimiter', ',')
-                has_header = preset.get('has_header', True)
-                skip_rows = preset.get('skip_rows', 0)
-                
-                raw_df = pd.read_csv(
-                    filepath,
-                    delimiter=delimiter,
-                    header=0 if has_header else None,
-                    skiprows=skip_rows
+    filepaths = [os.path.join(account_raw_dir, f) for f in csv_files]
+    
+    def extract(filepath: str) -> Optional[ExtractedFile]:
+        return extract_file(filepath, account_id, account_row, preset, categories, manifest, read_options, plans)
+    
+    if file_workers > 1 and len(filepaths) > 1:
+        with ThreadPoolExecutor(max_workers=min(file_workers, len(filepaths))) as executor:
+            results = list(executor.map(extract, filepaths))
+    else:
+        results = [extract(filepath) for filepath in filepaths]
+    
+    extracted = [extracted_file for extracted_file in results if extracted_file is not None]
+    # Merge oldest statements first so runs are deterministic
+    extracted.sort(key=statement_order)
+    return extracted
+
+
+def load_file(account_id: str, extracted_file: ExtractedFile, session: ETLSession) -> int:
+    """Apply one normalized file to the session, returning rows processed"""
+    try:
+        # A changed file drops rows it no longer contains
+        if extracted_file.status == 'changed':
+            current_ids = set(extracted_file.ids())
+            stale_ids = [
+                tx_id for tx_id in session.manifest.previous_ids(extracted_file.filepath)
+                if tx_id not in current_ids
+            ]
+            # Rows another ingested file of the account still supplies stay
+            if stale_ids:
+                shared = session.manifest.shared_ids(stale_ids, account_id, extracted_file.filepath)
+                session.retract([tx_id for tx_id in stale_ids if tx_id not in shared], account_id)
+        
+        # Apply delta load for each file individually
+        if extracted_file.frames:
+            with extracted_file.recorder.stage('merge', rows_in=extracted_file.rows) as record:
+                # Overlapping statements: skip rows an earlier file already supplied
+                frames, dropped = session.drop_run_duplicates(
+                    extracted_file.frames, account_id, extracted_file.filepath
                 )
-            else:
-                raw_df = pd.read_csv(filepath)
-            
-            if raw_df.empty:
-                logging.info(f"Skipping empty file: {filename}")
-                continue
-            
-            # Normalize to canonical schema
-            normalized_df = normalize_to_canonical_schema(raw_df, account_row, preset, categories)
-            if not normalized_df.empty:
-                # Apply delta load for each file individually
-                result_df = delta_load_transactions(normalized_df, account_id, accounts)
-                processed_count += len(normalized_df)
-                logging.info(f"Processed {len(normalized_df)} transactions from {filename}")
-            
-        except Exception as e:
-            logging.error(f"Failed to process {filename} for account {account_id}: {e}")
-            continue
+                extracted_file.recorder.count('merge', 'duplicates_dropped', dropped)
+                if frames:
+                    record['rows_out'] += session.apply_delta(frames, account_id)
+            logging.info(f"Processed {extracted_file.rows} transactions from {extracted_file.filename}")
+        
+        # Record every id the file contains, including rows dropped as repeats
+        if extracted_file.signature is not None:
+            session.manifest.record(
+                extracted_file.filepath, account_id, extracted_file.signature, extracted_file.ids()
+            )
+        if session.report is not None:
+            session.report.add(extracted_file.recorder)
+        session.file_applied(account_id, extracted_file.filepath)
+        return extracted_file.rows
+    except Exception as e:
+        logging.error(f"Failed to process {extracted_file.filename} for account {account_id}: {e}")
+        return 0
+
+
+def load_account(account_id: str, extracted: List[ExtractedFile], session: ETLSession) -> int:
+    """Apply an account's normalized files to the session, returning rows processed"""
+    processed_count = 0
+    for extracted_file in extracted:
+        processed_count += load_file(account_id, extracted_file, session)
     
     if processed_count == 0:
         logging.info(f"No usable data for account {account_id}")
+    else:
+        logging.info(f"Account {account_id} processing complete. Processed {processed_count} transactions.")
+    return processed_count
+
+
+def process_account(account_id: str, accounts: pd.DataFrame, presets: pd.DataFrame, categories: pd.DataFrame,
+                    session: Optional[ETLSession] = None, file_workers: int = 1,
+                    read_options: Optional[ReadOptions] = None,
+                    plans: Optional[PresetIndex] = None) -> Optional[pd.DataFrame]:
+    """Process all raw files for a single account"""
+    owns_session = session is None
+    if owns_session:
+        session = ETLSession(accounts)
+    
+    extracted = extract_account(
+        account_id, accounts, presets, categories, file_workers=file_workers, manifest=session.manifest,
+        read_options=read_options, plans=plans
+    )
+    if extracted is None:
         return None
     
-    # Load final result for return
-    result_df = pd.read_csv(TRANSACTIONS_FILE) if os.path.exists(TRANSACTIONS_FILE) else pd.DataFrame()
+    if load_account(account_id, extracted, session) == 0:
+        return None
+    
+    if owns_session:
+        session.commit()
+    
+    return session.account_transactions(account_id)
+
+
+def list_account_dirs() -> List[str]:
+    """Return the account folder names under data/raw"""
+    return [item for item in os.listdir(RAW_DIR) if os.path.isdir(os.path.join(RAW_DIR, item))]
+
+
+def select_accounts(account_ids: List[str], only: Optional[List[str]] = None) -> List[str]:
+    """Restrict account folders to the requested account numbers, in folder order"""
+    if only is None:
+        return account_ids
+    missing = [account_id for account_id in only if account_id not in account_ids]
+    for account_id in missing:
+        logging.warning(f"No raw directory for requested account {account_id}")
+    return [account_id for account_id in account_ids if account_id in only]
+
+
+def run_parallel(account_ids: List[str], accounts: pd.DataFrame, presets: pd.DataFrame,
+                 categories: pd.DataFrame, session: ETLSession, workers: int, file_workers: int = 1,
+                 read_options: Optional[ReadOptions] = None, plans: Optional[PresetIndex] = None) -> int:
+    """Extract accounts in a process pool and merge them through the single session writer"""
+    processed_accounts = 0
+    with ProcessPoolExecutor(max_workers=workers, **worker_logging()) as executor:
+        futures = {
+            executor.submit(
+                extract_account, account_id, accounts, presets, categories, file_workers, session.manifest,
+                read_options, plans
+            ): account_id
+            for account_id in account_ids
+        }
+        for future in as_completed(futures):
+            account_id = futures[future]
+            try:
+                extracted = future.result()
+            except Exception as e:
+                logging.error(f"Worker failed for account {account_id}: {e}")
+                continue
+            if extracted is not None and load_account(account_id, extracted, session) > 0:
+                processed_accounts += 1
+    return processed_accounts
+
+
+def ingest_file(account_id: str, filepath: str, accounts: pd.DataFrame, presets: pd.DataFrame,
+                categories: pd.DataFrame, session: ETLSession, plans: PresetIndex,
+                read_options: Optional[ReadOptions] = None) -> int:
+    """Ingest one newly arrived raw file into the resident table and commit it"""
+    resolved = resolve_account(account_id, accounts, presets, categories, plans)
+    if resolved is None:
+        return 0
+    account_row, preset = resolved
+    
+    extracted_file = extract_file(
+        filepath, account_id, account_row, preset, categories, session.manifest, read_options, plans
+    )
+    if extracted_file is None:
+        return 0
     
-    logging.info(f"Account {account_id} processing complete. Processed {processed_count} transactions.")
-    return result_df
+    # Pick up edits saved to the table since the last event
+    session.refresh()
+    processed_count = load_account(account_id, [extracted_file], session)
+    session.commit()
+    return processed_count
+
+
+def watch(accounts: pd.DataFrame, presets: pd.DataFrame, categories: pd.DataFrame, session: ETLSession,
+          plans: PresetIndex, read_options: Optional[ReadOptions] = None, debounce: float = WATCH_DEBOUNCE,
+          watcher: Optional[RawDirWatcher] = None) -> None:
+    """Ingest raw files as they land until interrupted"""
+    if watcher is None:
+        watcher = RawDirWatcher(RAW_DIR, RAW_FILE_SUFFIXES, debounce=debounce)
+    logging.info(f"Watching {RAW_DIR} for new statements (debounce {debounce}s)")
+    try:
+        while True:
+            for account_id, filepath in watcher.ready_files():
+                started = time.perf_counter()
+                processed_count = ingest_file(
+                    account_id, filepath, accounts, presets, categories, session, plans, read_options
+                )
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                logging.info(f"Ingested {processed_count} transactions from {filepath} in {elapsed_ms:.0f} ms")
+    except KeyboardInterrupt:
+        logging.info("Watch mode stopped")
 
 
-def main():
+class FileJob:
+    """A raw file moving through the staged pipeline"""
+
+    def __init__(self, account_id: str, account_row: pd.Series, preset: Optional[PresetPlan], filepath: str,
+                 profile: bool = False):
+        self.account_id = account_id
+        self.account_row = account_row
+        self.preset = preset
+        self.filepath = filepath
+        self.status = 'new'
+        self.signature: Optional[Dict] = None
+        self.failed = False
+        self.recorder = StageRecorder(account_id, os.path.basename(filepath), profile=profile)
+
+
+async def _discover_stage(account_ids: List[str], accounts: pd.DataFrame, presets: pd.DataFrame,
+                          categories: pd.DataFrame, plans: PresetIndex, read_options: ReadOptions,
+                          read_q: asyncio.Queue) -> None:
+    """Queue every raw file of every account folder"""
+    for account_id in account_ids:
+        resolved = resolve_account(account_id, accounts, presets, categories, plans)
+        if resolved is None:
+            continue
+        account_row, preset = resolved
+        account_raw_dir = os.path.join(RAW_DIR, str(account_id))
+        for filename in sorted(os.listdir(account_raw_dir)):
+            if is_raw_file(filename):
+                filepath = os.path.join(account_raw_dir, filename)
+                await read_q.put(FileJob(account_id, account_row, preset, filepath, read_options.profile))
+    await read_q.put(None)
+
+
+async def _read_stage(read_q: asyncio.Queue, normalize_q: asyncio.Queue, manifest: IngestionManifest,
+                      read_options: ReadOptions, plans: PresetIndex, executor: ThreadPoolExecutor) -> None:
+    """Read raw files (whole or chunked) off the event loop"""
+    loop = asyncio.get_running_loop()
+    while (job := await read_q.get()) is not None:
+        filename = os.path.basename(job.filepath)
+        try:
+            job.status, job.signature = await loop.run_in_executor(
+                executor, check_file, job.filepath, manifest, read_options
+            )
+            if job.status is None:
+                continue
+            job.preset = await loop.run_in_executor(executor, plans.route, job.filepath, job.preset)
+            chunk_rows = read_options.chunk_rows_for(job.filepath)
+            raw_frames = read_frames(job.filepath, job.preset, chunk_rows, read_options, job.recorder)
+            while (raw_df := await loop.run_in_executor(executor, next, raw_frames, None)) is not None:
+                await normalize_q.put((job, raw_df))
+        except Exception as e:
+            logging.error(f"Failed to process {filename} for account {job.account_id}: {e}")
+            job.failed = True
+        await normalize_q.put((job, None))
+    await normalize_q.put(None)
+
+
+async def _normalize_stage(normalize_q: asyncio.Queue, merge_q: asyncio.Queue, categories: pd.DataFrame,
+                           read_options: ReadOptions, executor: ThreadPoolExecutor) -> None:
+    """Normalize raw frames to the canonical schema off the event loop"""
+    loop = asyncio.get_running_loop()
+    while (item := await normalize_q.get()) is not None:
+        job, raw_df = item
+        if raw_df is None or job.failed or raw_df.empty:
+            if raw_df is None:
+                await merge_q.put(item)
+            continue
+        try:
+            normalized_df = await loop.run_in_executor(
+                executor, normalize_frame, raw_df, job.account_row, job.preset, categories, read_options, job.recorder
+            )
+        except Exception as e:
+            logging.error(f"Failed to process {os.path.basename(job.filepath)} for account {job.account_id}: {e}")
+            job.failed = True
+            continue
+        await merge_q.put((job, normalized_df))
+    await merge_q.put(None)
+
+
+async def _merge_stage(merge_q: asyncio.Queue, session: ETLSession, executor: ThreadPoolExecutor) -> set:
+    """Upsert each completed file into the session, returning accounts with data"""
+    loop = asyncio.get_running_loop()
+    frames: Dict[FileJob, List[pd.DataFrame]] = {}
+    loaded_accounts = set()
+    while (item := await merge_q.get()) is not None:
+        job, normalized_df = item
+        if normalized_df is not None:
+            frames.setdefault(job, []).append(normalized_df)
+            continue
+        job_frames = frames.pop(job, [])
+        if job.failed:
+            continue
+        extracted_file = ExtractedFile(job.filepath, job_frames, job.status, job.signature, job.recorder)
+        if await loop.run_in_executor(executor, load_file, job.account_id, extracted_file, session) > 0:
+            loaded_accounts.add(job.account_id)
+    return loaded_accounts
+
+
+async def run_pipeline(account_ids: List[str], accounts: pd.DataFrame, presets: pd.DataFrame,
+                       categories: pd.DataFrame, session: ETLSession, plans: PresetIndex,
+                       read_options: ReadOptions, queue_size: int = PIPELINE_QUEUE_SIZE) -> int:
+    """Run discover -> read -> normalize -> merge -> commit as concurrent stages"""
+    read_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    normalize_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    merge_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    loop = asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=1) as read_executor, \
+            ThreadPoolExecutor(max_workers=1) as normalize_executor, \
+            ThreadPoolExecutor(max_workers=1) as merge_executor:
+        _, _, _, loaded_accounts = await asyncio.gather(
+            _discover_stage(account_ids, accounts, presets, categories, plans, read_options, read_q),
+            _read_stage(read_q, normalize_q, session.manifest, read_options, plans, read_executor),
+            _normalize_stage(normalize_q, merge_q, categories, read_options, normalize_executor),
+            _merge_stage(merge_q, session, merge_executor),
+        )
+        await loop.run_in_executor(merge_executor, session.commit)
+    return len(loaded_accounts)
+
+
+def main(workers: int = 1, file_workers: int = 1, chunk_rows: Optional[int] = None,
+         memory_budget_mb: Optional[float] = None, engine: Optional[str] = None,
+         checkpoint_interval: Optional[float] = CHECKPOINT_INTERVAL, watch_mode: bool = False,
+         debounce: float = WATCH_DEBOUNCE, pipeline: bool = False, queue_size: int = PIPELINE_QUEUE_SIZE,
+         only_accounts: Optional[List[str]] = None, since: Optional[pd.Timestamp] = None,
+         force: bool = False, dry_run: bool = False, profile: bool = False, memory_map: bool = False):
     """Main ETL process"""
     logging.info("=" * 50)
-    logging.info("ETL process started")
+    logging.info("ETL process started" + (" (dry run)" if dry_run else ""))
     logging.info("=" * 50)
     
+    report = None
     try:
         # Load metadata
         accounts, categories, category_groups, presets = load_metadata()
         
+        # A dry run leaves the checkpoint of a real run untouched
+        checkpoint = None if dry_run else RunCheckpoint(CHECKPOINT_FILE)
+        if checkpoint is not None:
+            if checkpoint.resumed:
+                logging.info(
+                    f"Resuming run {checkpoint.run_id}: {checkpoint.committed_files} files already committed"
+                )
+            checkpoint.save()
+        
+        report = RunReport(checkpoint.run_id if checkpoint is not None else uuid.uuid4().hex[:12], {
+            'workers': workers, 'file_workers': file_workers, 'pipeline': pipeline, 'engine': engine,
+            'chunk_rows': chunk_rows, 'memory_budget_mb': memory_budget_mb, 'accounts': only_accounts,
+            'since': since.date().isoformat() if since is not None else None, 'force': force, 'dry_run': dry_run,
+            'profile': profile, 'memory_map': memory_map,
+        })
+        session = ETLSession(
+            accounts, engine=engine, checkpoint=checkpoint, checkpoint_interval=checkpoint_interval,
+            dry_run=dry_run, report=report, profile=profile
+        )
+        account_ids = select_accounts(list_account_dirs(), only_accounts)
+        read_options = ReadOptions(
+            chunk_rows, memory_budget_mb, concurrency=workers * file_workers, engine=engine, since=since,
+            force=force, profile=profile, memory_map=memory_map,
+            skip_files=checkpoint.resume_skip() if checkpoint is not None else frozenset()
+        )
+        if since is not None:
+            logging.info(f"Loading transactions dated on or after {since.date()}")
+        
+        # Compile every preset an account uses once; malformed ones fail here
+        plans = compile_presets(presets, categories, accounts['default_import_preset_id'].dropna().tolist())
+        # The rest only serve to route files whose layout matches another preset
+        plans.update(compile_presets(
+            presets, categories, [preset_id for preset_id in presets['id'] if preset_id not in plans], strict=False
+        ))
+        
+        # Snapshot data/raw before the catch-up run
+        watcher = RawDirWatcher(RAW_DIR, RAW_FILE_SUFFIXES, debounce=debounce) if watch_mode else None
+        
         # Process each account directory
-        processed_accounts = 0
-        for item in os.listdir(RAW_DIR):
-            account_dir = os.path.join(RAW_DIR, item)
-            if os.path.isdir(account_dir):
-                result = process_account(item, accounts, presets, categories)
+        if pipeline:
+            logging.info(f"Running staged pipeline over {len(account_ids)} accounts (queue size {queue_size})")
+            processed_accounts = asyncio.run(run_pipeline(
+                account_ids, accounts, presets, categories, session, plans, read_options, queue_size
+            ))
+        elif workers > 1:
+            logging.info(f"Extracting {len(account_ids)} accounts with {workers} worker processes")
+            processed_accounts = run_parallel(
+                account_ids, accounts, presets, categories, session, workers, file_workers, read_options, plans
+            )
+        else:
+            processed_accounts = 0
+            for account_id in account_ids:
+                result = process_account(
+                    account_id, accounts, presets, categories, session=session, file_workers=file_workers,
+                    read_options=read_options, plans=plans
+                )
                 if result is not None:
                     processed_accounts += 1
         
+        # Final sorted write; earlier checkpoints only happen on long runs
+        session.commit()
+        if checkpoint is not None:
+            checkpoint.complete()
+        
         logging.info(f"ETL process completed. Processed {processed_accounts} accounts.")
         
-        # Log final stats
-        if os.path.exists(TRANSACTIONS_FILE):
-            final_df = pd.read_csv(TRANSACTIONS_FILE)
-            logging.info(f"Final transactions.csv contains {len(final_df)} total transactions")
+        # Log final stats from the resident table
+        for account_id, counts in session.account_summary().items():
+            logging.info(
+                f"Account {account_id}: {counts['new']} rows inserted, {counts['matched']} already stored, "
+                f"{counts['total']} total"
+            )
+        if session.transactions is not None:
+            logging.info(f"Final transactions.csv contains {len(session.transactions)} total transactions")
+        
+        report.add(session.recorder)
+        report_path = report.save('completed', REPORT_DIR)
+        account_summary = session.account_summary()
+        logging.info("ETL run summary", extra={'run_summary': report.summary(
+            'completed',
+            dry_run=dry_run,
+            accounts=processed_accounts,
+            inserted=sum(counts['new'] for counts in account_summary.values()),
+            matched=sum(counts['matched'] for counts in account_summary.values()),
+            total_transactions=len(session.transactions) if session.transactions is not None else 0,
+            report=report_path,
+        )})
+        # Watch mode ingests indefinitely; only the catch-up run is reported
+        session.report = None
+        report = None
+        
+        if watch_mode:
+            # Files that change from now on are ingested again
+            read_options.skip_files = frozenset()
+            watch(accounts, presets, categories, session, plans, read_options, debounce, watcher)
             
     except Exception as e:
         logging.error(f"ETL process failed: {e}")
+        if report is not None:
+            report_path = report.save('failed', REPORT_DIR)
+            logging.error("ETL run summary", extra={'run_summary': report.summary(
+                'failed', dry_run=dry_run, error=str(e), report=report_path
+            )})
         raise
 
 
+def account_list(value: str) -> List[str]:
+    """argparse type for a comma-separated list of account numbers"""
+    account_ids = [account_id.strip() for account_id in value.split(',') if account_id.strip()]
+    if not account_ids or not all(account_id.isdigit() for account_id in account_ids):
+        raise argparse.ArgumentTypeError(f"expected comma-separated account numbers, got '{value}'")
+    return account_ids
+
+
+def since_date(value: str) -> pd.Timestamp:
+    """argparse type for a YYYY-MM-DD date"""
+    try:
+        return pd.Timestamp(datetime.strptime(value, '%Y-%m-%d'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a YYYY-MM-DD date, got '{value}'")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse ETL command-line options"""
+    parser = argparse.ArgumentParser(description="Load raw bank exports into the canonical transactions table")
+    parser.add_argument(
+        '--accounts', type=account_list, default=None, metavar='NUMBERS',
+        help="only process these account folders, e.g. 7729,5440 (default: all)"
+    )
+    parser.add_argument(
+        '--since', type=since_date, default=None, metavar='YYYY-MM-DD',
+        help="only load transactions dated on or after this day"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="re-read raw files even if they are unchanged since their last import (e.g. after a preset fix)"
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help="parse and merge as usual but write nothing"
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help=f"profile each stage with cProfile; .pstats files are saved next to the run report in {REPORT_DIR}"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="number of processes used to parse and normalize accounts (default: 1)"
+    )
+    parser.add_argument(
+        '--file-workers', type=int, default=1,
+        help="number of threads reading raw files within each account (default: 1)"
+    )
+    parser.add_argument(
+        '--chunk-rows', type=int, default=None,
+        help="stream raw files in chunks of this many rows instead of reading them whole"
+    )
+    parser.add_argument(
+        '--memory-budget', type=float, default=None, metavar='MB',
+        help="derive chunk sizes so concurrent raw reads stay within this many megabytes"
+    )
+    parser.add_argument(
+        '--engine', choices=CSV_ENGINES, default=None,
+        help="CSV parser for raw and canonical files; pyarrow falls back to c when an option is unsupported"
+    )
+    parser.add_argument(
+        '--mmap', action='store_true',
+        help="parse uncompressed raw files from a memory map instead of buffered reads"
+    )
+    parser.add_argument(
+        '--checkpoint-interval', type=float, default=CHECKPOINT_INTERVAL, metavar='SECONDS',
+        help=f"commit progress at least this often so a failed run can resume (default: {CHECKPOINT_INTERVAL})"
+    )
+    parser.add_argument(
+        '--pipeline', action='store_true',
+        help="overlap reading, normalizing and merging files in an asyncio staged pipeline"
+    )
+    parser.add_argument(
+        '--queue-size', type=int, default=PIPELINE_QUEUE_SIZE,
+        help=f"items buffered between pipeline stages (default: {PIPELINE_QUEUE_SIZE})"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="after the initial run, keep watching data/raw and ingest files as they arrive"
+    )
+    parser.add_argument(
+        '--debounce', type=float, default=WATCH_DEBOUNCE, metavar='SECONDS',
+        help=f"how long a file must stay unchanged before watch mode ingests it (default: {WATCH_DEBOUNCE})"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    log_listener = start_logging(LOG_FILE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT)
+    try:
+        main(
+            workers=args.workers,
+            file_workers=args.file_workers,
+            chunk_rows=args.chunk_rows,
+            memory_budget_mb=args.memory_budget,
+            engine=args.engine,
+            checkpoint_interval=args.checkpoint_interval,
+            watch_mode=args.watch,
+            debounce=args.debounce,
+            pipeline=args.pipeline,
+            queue_size=args.queue_size,
+            only_accounts=args.accounts,
+            since=args.since,
+            force=args.force,
+            dry_run=args.dry_run,
+            profile=args.profile,
+            memory_map=args.mmap,
+        )
+    finally:
+        log_listener.stop()
@@ -0,0 +1,31 @@
+import json
+import os
+from typing import Callable, Dict
+
+
+def atomic_write(path: str, write: Callable[[str], None]) -> None:
+    """Write a file via a temporary sibling and rename it into place"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    """Atomically write a text file"""
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+    atomic_write(path, write)
+
+
+def atomic_write_json(path: str, data: Dict) -> None:
+    """Atomically write a JSON document"""
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+    atomic_write(path, write)
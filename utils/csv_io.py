@@ -0,0 +1,128 @@
+import csv
+import gzip
+import importlib.util
+import io
+import logging
+import os
+import zipfile
+import pandas as pd
+
+# Parser engine used when callers don't pick one: "c" (pandas default) or "pyarrow"
+DEFAULT_ENGINE = os.getenv("SALDO_CSV_ENGINE", "c")
+
+CSV_ENGINES = ("c", "pyarrow")
+
+# read_csv options the pyarrow reader understands; anything else set to a
+# non-default value (chunksize, skiprows, ...) sends the read to the C parser
+PYARROW_OPTIONS = {"delimiter", "sep", "header", "usecols", "dtype", "memory_map"}
+
+# Compressed files are decompressed while they are parsed, chosen by suffix
+# the same way pandas infers `compression`
+COMPRESSION_BY_SUFFIX = {".gz": "gzip", ".zst": "zstd", ".zip": "zip"}
+
+
+def compression_of(filepath):
+    """Return the compression a file's suffix implies, or None"""
+    return COMPRESSION_BY_SUFFIX.get(os.path.splitext(filepath)[1].lower())
+
+
+def open_raw(filepath):
+    """Open a CSV as a binary stream, decompressing on the fly"""
+    compression = compression_of(filepath)
+    if compression is None:
+        return open(filepath, "rb")
+    if compression == "gzip":
+        return gzip.open(filepath, "rb")
+    if compression == "zstd":
+        import zstandard  # optional, as for pandas
+        return zstandard.open(filepath, "rb")
+    # The member keeps the archive's file open after the archive is closed
+    with zipfile.ZipFile(filepath) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        if len(members) != 1:
+            raise ValueError(f"Expected one file in ZIP archive {filepath}, found {len(members)}")
+        return archive.open(members[0])
+
+
+def open_text(filepath, encoding="utf-8"):
+    """Open a possibly compressed CSV for streaming text reads"""
+    return io.TextIOWrapper(open_raw(filepath), encoding=encoding, newline="")
+
+
+def pyarrow_available():
+    """Check whether pyarrow can be imported without importing it"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _pyarrow_blocker(filepath, kwargs):
+    """Return why a read can't use pyarrow, or None if it can"""
+    if not pyarrow_available():
+        return "pyarrow is not installed"
+    if compression_of(filepath) == "zip":
+        return "ZIP archives are not supported by the pyarrow reader"
+    for option, value in kwargs.items():
+        if option not in PYARROW_OPTIONS and value not in (None, 0, False):
+            return f"'{option}' is not supported by the pyarrow reader"
+    if kwargs.get("header", "infer") not in ("infer", 0, None):
+        return "only header=0 or header=None is supported by the pyarrow reader"
+    if kwargs.get("dtype") is not None and not isinstance(kwargs["dtype"], dict):
+        return "only per-column dtypes are supported by the pyarrow reader"
+    return None
+
+
+def _header_columns(filepath, delimiter=","):
+    """Read just the header row of a (possibly compressed) CSV file"""
+    with open_text(filepath) as f:
+        return next(csv.reader(f, delimiter=delimiter), [])
+
+
+def _read_csv_pyarrow(filepath, delimiter=None, sep=None, header="infer", usecols=None, dtype=None,
+                      memory_map=False, **_):
+    """Read a CSV with pyarrow's multithreaded reader into a pandas frame"""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    delimiter = delimiter or sep or ","
+    has_header = header is not None
+
+    if callable(usecols):
+        if not has_header:
+            raise ValueError("callable usecols needs a header row")
+        usecols = [column for column in _header_columns(filepath, delimiter) if usecols(column)]
+
+    # Text columns are read as strings so pyarrow doesn't infer timestamps
+    column_types = {column: pa.string() for column, kind in (dtype or {}).items() if kind is str}
+
+    table = pa_csv.read_csv(
+        pa.memory_map(filepath) if memory_map else filepath,
+        read_options=pa_csv.ReadOptions(autogenerate_column_names=not has_header),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            include_columns=list(usecols) if usecols is not None else None,
+            strings_can_be_null=True,
+        ),
+    )
+    df = table.to_pandas()
+    if not has_header:
+        df.columns = range(len(df.columns))
+    return df
+
+
+def read_csv(filepath, engine=None, **kwargs):
+    """pd.read_csv with a selectable parser engine, falling back to the C parser when pyarrow can't read the file"""
+    engine = engine or DEFAULT_ENGINE
+    if kwargs.get("memory_map") and compression_of(filepath) is not None:
+        kwargs["memory_map"] = False
+    if engine == "pyarrow":
+        reason = _pyarrow_blocker(filepath, kwargs)
+        if reason is None:
+            try:
+                return _read_csv_pyarrow(filepath, **kwargs)
+            except (ValueError, OSError, ImportError) as e:
+                reason = str(e)
+        logging.info(f"Using the default CSV parser for {filepath}: {reason}")
+    elif engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine: {engine}")
+
+    return pd.read_csv(filepath, **kwargs)
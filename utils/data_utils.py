@@ -3,6 +3,14 @@ import numpy as np
 import os
 from datetime import datetime, timedelta
 import streamlit as st
+from utils.csv_io import read_csv
+
+# Text columns of transactions.csv, read as strings so no parser engine
+# converts them (e.g. pyarrow turning created_at/updated_at into datetimes
+# that are saved back in a different format); matches etl.CANONICAL_TEXT_DTYPES
+TRANSACTION_TEXT_DTYPES = {
+    'id': str, 'description': str, 'created_at': str, 'updated_at': str, 'transaction_type': str
+}
 
 def load_categories():
     """Load categories from CSV"""
@@ -67,13 +75,16 @@ def load_accounts():
         st.error(f"Error loading accounts: {str(e)}")
         return pd.DataFrame()
 
-def load_transactions():
-    """Load transactions from CSV"""
+def load_transactions(engine=None):
+    """Load transactions from CSV
+
+    engine: CSV parser ("c" or "pyarrow"); defaults to SALDO_CSV_ENGINE
+    """
     transactions_path = "data/processed/transactions.csv"
     
     try:
         if os.path.exists(transactions_path):
-            df = pd.read_csv(transactions_path)
+            df = read_csv(transactions_path, engine=engine, dtype=TRANSACTION_TEXT_DTYPES)
             df['date'] = pd.to_datetime(df['date'])
             df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
             return df
@@ -0,0 +1,99 @@
+import logging
+import math
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.atomic_io import atomic_write
+
+# Target false positive rate, and the fewest ids a new filter is sized for
+BLOOM_ERROR_RATE = 0.01
+BLOOM_MIN_CAPACITY = 100_000
+
+
+class IdBloomFilter:
+    """Bloom filter over transaction ids, persisted beside the table"""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = max(int(capacity), 1)
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+        # Size and mtime of the table file the saved filter matches
+        self.table_signature: Optional[Tuple[int, float]] = None
+
+    @classmethod
+    def build(cls, ids: List[str], error_rate: float = BLOOM_ERROR_RATE) -> 'IdBloomFilter':
+        """A filter holding `ids` with room for as many again"""
+        bloom = cls(max(BLOOM_MIN_CAPACITY, 2 * len(ids)), error_rate)
+        bloom.add(ids)
+        return bloom
+
+    def _positions(self, ids: List[str]) -> np.ndarray:
+        """Bit positions of each id, one row of `num_hashes` per id"""
+        h1 = np.array([int(tx_id, 16) for tx_id in ids], dtype=np.uint64)
+        # Second hash: the id's 24-bit halves swapped, forced odd
+        h2 = ((h1 >> np.uint64(24)) | ((h1 & np.uint64(0xFFFFFF)) << np.uint64(24))) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, ids: List[str]) -> None:
+        if not len(ids):
+            return
+        positions = self._positions(ids).ravel()
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+        self.count += len(ids)
+
+    def might_contain(self, ids: List[str]) -> np.ndarray:
+        """Boolean array: False where an id is certainly not stored"""
+        if not len(ids):
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(ids)
+        hits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+    @property
+    def full(self) -> bool:
+        return self.count > self.capacity
+
+    def save(self, path: str, table_signature: Tuple[int, float]) -> None:
+        """Atomically write the filter, tagged with the table file it matches"""
+        self.table_signature = table_signature
+        def write(tmp_path: str) -> None:
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f, bits=self.bits, num_bits=self.num_bits, num_hashes=self.num_hashes,
+                    count=self.count, capacity=self.capacity, table_signature=np.array(table_signature)
+                )
+                f.flush()
+                os.fsync(f.fileno())
+        atomic_write(path, write)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['IdBloomFilter']:
+        """Read a saved filter, or None if it is missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                bloom = cls.__new__(cls)
+                bloom.bits = data['bits']
+                bloom.num_bits = int(data['num_bits'])
+                bloom.num_hashes = int(data['num_hashes'])
+                bloom.count = int(data['count'])
+                bloom.capacity = int(data['capacity'])
+                size, mtime = data['table_signature'].tolist()
+                bloom.table_signature = (int(size), mtime)
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable id filter {path}: {e}")
+            return None
+        return bloom
+
+
+def table_signature(path: str) -> Tuple[int, float]:
+    """Size and mtime identifying one version of a file"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
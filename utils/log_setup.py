@@ -0,0 +1,63 @@
+import json
+import logging
+import multiprocessing
+import os
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Queue the active listener drains, shared with worker processes
+_log_queue = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+def install_queue_handler(log_queue, level=logging.INFO):
+    """Send this process's log records to `log_queue` instead of writing them"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+
+def start_logging(log_file, level=logging.INFO, max_bytes=10 * 1024 * 1024, backup_count=5):
+    """Route logging through a queue to a rotating JSON-lines file; stop the returned listener to flush"""
+    global _log_queue
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.setFormatter(JsonFormatter())
+
+    # A multiprocessing queue so worker processes can log through it too
+    _log_queue = multiprocessing.Queue(-1)
+    install_queue_handler(_log_queue, level)
+    listener = QueueListener(_log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def worker_logging():
+    """ProcessPoolExecutor kwargs that make workers log through the active queue"""
+    if _log_queue is None:
+        return {}
+    return {"initializer": install_queue_handler, "initargs": (_log_queue,)}
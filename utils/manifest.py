@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.atomic_io import atomic_write_json, atomic_write_text
+
+
+def hash_file(filepath: str, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """Persistent record of every raw file ingested into the canonical table"""
+
+    def __init__(self, manifest_file: str, ids_dir: Optional[str] = None):
+        self.manifest_file = manifest_file
+        self.ids_dir = ids_dir or os.path.splitext(manifest_file)[0] + '_ids'
+        self.files: Dict[str, Dict] = {}
+        self.dirty = False
+        # Path -> ids, loaded on demand or recorded and not yet written
+        self._ids: Dict[str, List[str]] = {}
+        self._unsaved: set = set()
+        # Id files of replaced entries, deleted once the manifest is saved
+        self._superseded: List[str] = []
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                self.files = json.load(f).get('files', {})
+        # Older manifests kept ids inline
+        for filepath, entry in self.files.items():
+            if 'ids' in entry:
+                self._ids[filepath] = entry.pop('ids')
+                entry['ids_file'] = self._ids_file_name(filepath, entry)
+                self._unsaved.add(filepath)
+                self.dirty = True
+
+    def __getstate__(self) -> Dict:
+        # Workers only check signatures, so the id lists stay behind
+        return {**self.__dict__, '_ids': {}, '_unsaved': set(), '_superseded': []}
+
+    @staticmethod
+    def _ids_file_name(filepath: str, signature: Dict) -> str:
+        """One id file per path and content version"""
+        path_hash = hashlib.sha1(filepath.encode()).hexdigest()[:16]
+        return f"{path_hash}_{signature['sha256'][:16]}.txt"
+
+    def check(self, filepath: str) -> Tuple[str, Dict]:
+        """Classify a file as 'new', 'changed' or 'unchanged' and return its signature"""
+        stat = os.stat(filepath)
+        signature = {'size': stat.st_size, 'mtime': stat.st_mtime}
+        entry = self.files.get(filepath)
+        if entry is None:
+            signature['sha256'] = hash_file(filepath)
+            return 'new', signature
+        if entry['size'] == signature['size'] and entry['mtime'] == signature['mtime']:
+            signature['sha256'] = entry['sha256']
+            return 'unchanged', signature
+
+        signature['sha256'] = hash_file(filepath)
+        if signature['sha256'] == entry['sha256']:
+            return 'unchanged', signature
+        return 'changed', signature
+
+    def previous_ids(self, filepath: str) -> List[str]:
+        """Transaction IDs the last ingestion of this file contributed"""
+        if filepath not in self._ids:
+            entry = self.files.get(filepath)
+            if entry is None or 'ids_file' not in entry:
+                return []
+            with open(os.path.join(self.ids_dir, entry['ids_file'])) as f:
+                self._ids[filepath] = f.read().split()
+        return self._ids[filepath]
+
+    def shared_ids(self, ids: List[str], account_id: str, filepath: str) -> set:
+        """Which of `ids` another ingested file of the account also contributed"""
+        wanted = set(ids)
+        shared = set()
+        for other_path, entry in self.files.items():
+            if not wanted:
+                break
+            if other_path != filepath and entry.get('account_id') == str(account_id):
+                found = wanted.intersection(self.previous_ids(other_path))
+                shared |= found
+                wanted -= found
+        return shared
+
+    def record(self, filepath: str, account_id: str, signature: Dict, ids: List[str]) -> None:
+        """Remember a successfully ingested file"""
+        previous = self.files.get(filepath, {}).get('ids_file')
+        ids_file = self._ids_file_name(filepath, signature)
+        if previous is not None and previous != ids_file:
+            self._superseded.append(previous)
+        self.files[filepath] = {
+            **signature,
+            'account_id': str(account_id),
+            'rows': len(ids),
+            'ids_file': ids_file,
+            'ingested_at': datetime.now().isoformat(),
+        }
+        self._ids[filepath] = ids
+        self._unsaved.add(filepath)
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write new id files, then the manifest, if anything changed"""
+        if not self.dirty:
+            return
+        os.makedirs(self.ids_dir, exist_ok=True)
+        for filepath in self._unsaved:
+            ids_path = os.path.join(self.ids_dir, self.files[filepath]['ids_file'])
+            atomic_write_text(ids_path, '\n'.join(self._ids[filepath]))
+        self._unsaved = set()
+        atomic_write_json(self.manifest_file, {'files': self.files})
+        self.dirty = False
+        
+        # Remove id files of replaced versions
+        in_use = {entry.get('ids_file') for entry in self.files.values()}
+        for ids_file in self._superseded:
+            if ids_file not in in_use and os.path.exists(os.path.join(self.ids_dir, ids_file)):
+                os.remove(os.path.join(self.ids_dir, ids_file))
+        self._superseded = []
+
+
+class RunCheckpoint:
+    """Which accounts and files a run has durably committed"""
+
+    def __init__(self, checkpoint_file: str):
+        self.checkpoint_file = checkpoint_file
+        state = {}
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file) as f:
+                state = json.load(f)
+
+        self.resumed = state.get('status') == 'running'
+        if self.resumed:
+            self.run_id = state['run_id']
+            self.started_at = state['started_at']
+            self.committed: Dict[str, List[str]] = state.get('committed', {})
+        else:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.started_at = datetime.now().isoformat()
+            self.committed = {}
+        self.status = 'running'
+
+    @property
+    def committed_files(self) -> int:
+        return sum(len(files) for files in self.committed.values())
+
+    def resume_skip(self) -> frozenset:
+        """Paths a resumed run already committed, or none for a fresh run"""
+        if not self.resumed:
+            return frozenset()
+        return frozenset(filepath for files in self.committed.values() for filepath in files)
+
+    def mark_committed(self, files: List[Tuple[str, str]]) -> None:
+        """Record (account_id, filepath) pairs made durable by a commit"""
+        for account_id, filepath in files:
+            account_files = self.committed.setdefault(str(account_id), [])
+            if filepath not in account_files:
+                account_files.append(filepath)
+
+    def save(self) -> None:
+        atomic_write_json(self.checkpoint_file, {
+            'run_id': self.run_id,
+            'status': self.status,
+            'started_at': self.started_at,
+            'updated_at': datetime.now().isoformat(),
+            'committed': self.committed,
+        })
+
+    def complete(self) -> None:
+        """Mark the run finished so the next one starts fresh"""
+        self.status = 'completed'
+        self.save()
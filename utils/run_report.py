@@ -0,0 +1,232 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from utils.atomic_io import atomic_write_json
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+# Optional per-stage counters summed into the report totals
+REPORT_COUNTERS = ('unparseable_amounts', 'duplicates_dropped')
+
+# --profile: how many functions each stage's log summary lists
+PROFILE_TOP_N = 25
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Peak resident set size of this process (or its largest finished child) so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageRecorder:
+    """Wall time, row counts and bytes read per ETL stage of one file"""
+
+    def __init__(self, account_id: Optional[str] = None, filename: Optional[str] = None, profile: bool = False):
+        self.account_id = str(account_id) if account_id is not None else None
+        self.filename = filename
+        self.stages: Dict[str, Dict] = {}
+        # thread id -> stack of [record, time the record last (re)started, profiler]
+        self._active: Dict[int, List[List]] = {}
+        self._profilers: Optional[Dict[str, cProfile.Profile]] = {} if profile else None
+        # Stats of profilers that were snapshotted to cross a process boundary
+        self._profile_snapshots: Dict[str, Dict] = {}
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0, bytes_read: int = 0) -> Iterator[Dict]:
+        """Time a block as `name`; the caller adds to the yielded record's rows_out"""
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = {
+                'stage': name, 'account_id': self.account_id, 'file': self.filename, 'calls': 0,
+                'wall_s': 0.0, 'rows_in': 0, 'rows_out': 0, 'bytes_read': 0, 'peak_rss_mb': None,
+            }
+        record['calls'] += 1
+        record['rows_in'] += rows_in
+        record['bytes_read'] += bytes_read
+        
+        stack = self._active.setdefault(threading.get_ident(), [])
+        profiler = None
+        if self._profilers is not None:
+            if stack and stack[-1][2] is not None:
+                stack[-1][2].disable()
+            profiler = self._enable_profiler(name)
+        now = time.perf_counter()
+        if stack:
+            outer = stack[-1]
+            outer[0]['wall_s'] += now - outer[1]
+        stack.append([record, now, profiler])
+        try:
+            yield record
+        finally:
+            now = time.perf_counter()
+            record['wall_s'] += now - stack.pop()[1]
+            if stack:
+                stack[-1][1] = now
+            if profiler is not None:
+                profiler.disable()
+            if stack and stack[-1][2] is not None and self._enable_profiler(stack[-1][0]['stage']) is None:
+                stack[-1][2] = None
+            record['peak_rss_mb'] = peak_rss_mb()
+
+    def count(self, name: str, counter: str, n: int) -> None:
+        """Add to a named counter on a stage's record, e.g. rows rejected"""
+        record = self.stages.get(name)
+        if record is not None:
+            record[counter] = record.get(counter, 0) + n
+
+    def _enable_profiler(self, name: str) -> Optional[cProfile.Profile]:
+        """Start (or resume) a stage's profiler, or return None if another profiler is active"""
+        profiler = self._profilers.setdefault(name, cProfile.Profile())
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another thread's stage is already being profiled
+            return None
+        return profiler
+
+    def profile_stats(self) -> Dict[str, Dict]:
+        """Raw cProfile stats per stage, loadable with pstats"""
+        stats = dict(self._profile_snapshots)
+        for name, profiler in (self._profilers or {}).items():
+            profiler.create_stats()
+            stats[name] = profiler.stats
+        return stats
+
+    def records(self) -> List[Dict]:
+        """Finished stage records with throughput filled in"""
+        records = []
+        for record in self.stages.values():
+            rows = record['rows_out'] or record['rows_in']
+            records.append({
+                **record,
+                'wall_s': round(record['wall_s'], 6),
+                'rows_per_sec': round(rows / record['wall_s'], 1) if rows and record['wall_s'] > 0 else None,
+            })
+        return records
+
+    def __getstate__(self) -> Dict:
+        # Profilers can't be pickled; ship their stats instead
+        return {
+            **self.__dict__, '_active': {}, '_profilers': {} if self._profilers is not None else None,
+            '_profile_snapshots': self.profile_stats(),
+        }
+
+
+class ProfileSnapshot:
+    """Raw cProfile stats in the shape pstats.Stats accepts in place of a Profile"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class RunReport:
+    """Machine-readable metrics of one ETL run, written as JSON to data/logs"""
+
+    def __init__(self, run_id: str, options: Dict):
+        self.run_id = run_id
+        self.options = options
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.records: List[Dict] = []
+        # Stage name -> cProfile stats merged across files (--profile only)
+        self.profiles: Dict[str, pstats.Stats] = {}
+
+    def add(self, recorder: StageRecorder) -> None:
+        self.records.extend(recorder.records())
+        for name, stats in recorder.profile_stats().items():
+            if name in self.profiles:
+                self.profiles[name].add(ProfileSnapshot(stats))
+            else:
+                self.profiles[name] = pstats.Stats(ProfileSnapshot(stats))
+
+    def totals(self) -> Dict[str, Dict]:
+        """Per-stage sums across accounts and files"""
+        totals: Dict[str, Dict] = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {
+                'records': 0, 'wall_s': 0.0, 'rows_in': 0, 'rows_out': 0, 'bytes_read': 0,
+            })
+            total['records'] += 1
+            for field in ('wall_s', 'rows_in', 'rows_out', 'bytes_read'):
+                total[field] += record[field]
+            for counter in REPORT_COUNTERS:
+                if counter in record:
+                    total[counter] = total.get(counter, 0) + record[counter]
+        for total in totals.values():
+            rows = total['rows_out'] or total['rows_in']
+            total['wall_s'] = round(total['wall_s'], 6)
+            total['rows_per_sec'] = round(rows / total['wall_s'], 1) if rows and total['wall_s'] > 0 else None
+        return totals
+
+    def summary(self, status: str, **fields) -> Dict:
+        """One-record digest of the run for the log"""
+        totals = self.totals()
+        return {
+            'run_id': self.run_id,
+            'status': status,
+            'wall_s': round(time.perf_counter() - self._started, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            **fields,
+            'rows_per_sec': {name: total['rows_per_sec'] for name, total in totals.items()},
+            'unparseable_amounts': totals.get('normalize', {}).get('unparseable_amounts', 0),
+            'duplicates_dropped': totals.get('merge', {}).get('duplicates_dropped', 0),
+        }
+
+    def save_profiles(self, report_dir: str) -> Dict[str, str]:
+        """Write one .pstats file per stage and log each stage's hottest functions"""
+        paths = {}
+        for name, stats in self.profiles.items():
+            profile_path = os.path.join(report_dir, f"{self._basename()}_{name}.pstats")
+            stats.dump_stats(profile_path)
+            paths[name] = profile_path
+            
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+            logging.info(
+                f"Profile of stage '{name}' written to {profile_path}; "
+                f"top {PROFILE_TOP_N} by cumulative time:\n{summary.getvalue()}"
+            )
+        return paths
+
+    def _basename(self) -> str:
+        return f"etl_run_{self.started_at:%Y%m%d_%H%M%S}_{self.run_id}"
+
+    def save(self, status: str, report_dir: str) -> str:
+        """Write the report (and any stage profiles) and return its path"""
+        os.makedirs(report_dir, exist_ok=True)
+        report_path = os.path.join(report_dir, f"{self._basename()}.json")
+        profile_paths = self.save_profiles(report_dir)
+        atomic_write_json(report_path, {
+            'run_id': self.run_id,
+            'status': status,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'wall_s': round(time.perf_counter() - self._started, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'worker_peak_rss_mb': peak_rss_mb(children=True),
+            'options': self.options,
+            'totals': self.totals(),
+            'profiles': profile_paths,
+            'stages': self.records,
+        })
+        logging.info(f"Run report written to {report_path}")
+        return report_path
@@ -0,0 +1,108 @@
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+# Seconds a file must stay unchanged before it is reported, and the polling interval without inotify
+WATCH_DEBOUNCE = 2.0
+WATCH_POLL_INTERVAL = 1.0
+
+
+class RawDirWatcher:
+    """Report raw statement files that appear or change under the raw directory"""
+
+    def __init__(self, raw_dir: str, suffixes: Tuple[str, ...], debounce: float = WATCH_DEBOUNCE,
+                 poll_interval: float = WATCH_POLL_INTERVAL):
+        self.raw_dir = raw_dir
+        self.suffixes = suffixes
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._known = self._scan()
+        # filepath -> (size, mtime, time the signature was first seen)
+        self._pending: Dict[str, Tuple[int, float, float]] = {}
+        self._inotify = self._start_inotify()
+
+    def _scan(self) -> Dict[str, Tuple[int, float]]:
+        """Stat every raw file currently on disk"""
+        seen = {}
+        for account_id in os.listdir(self.raw_dir):
+            account_dir = os.path.join(self.raw_dir, account_id)
+            if not os.path.isdir(account_dir):
+                continue
+            for filename in os.listdir(account_dir):
+                if filename.endswith(self.suffixes):
+                    filepath = os.path.join(account_dir, filename)
+                    try:
+                        stat = os.stat(filepath)
+                    except FileNotFoundError:
+                        continue
+                    seen[filepath] = (stat.st_size, stat.st_mtime)
+        return seen
+
+    def _start_inotify(self):
+        """Watch the raw directory and each account folder, or return None to poll"""
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            logging.info(f"inotify_simple not installed; watching {self.raw_dir} by polling")
+            return None
+
+        inotify = INotify()
+        self._watch_mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+        self._watch_dirs = {inotify.add_watch(self.raw_dir, flags.CREATE | flags.MOVED_TO): self.raw_dir}
+        for account_id in os.listdir(self.raw_dir):
+            account_dir = os.path.join(self.raw_dir, account_id)
+            if os.path.isdir(account_dir):
+                self._watch_dirs[inotify.add_watch(account_dir, self._watch_mask)] = account_dir
+        logging.info(f"Watching {len(self._watch_dirs) - 1} account folders with inotify")
+        return inotify
+
+    def _collect_changes(self) -> None:
+        """Queue files that are new or changed since they were last reported"""
+        if self._inotify is not None:
+            for event in self._inotify.read(timeout=int(self.poll_interval * 1000)):
+                directory = self._watch_dirs.get(event.wd)
+                if directory is None or not event.name:
+                    continue
+                path = os.path.join(directory, event.name)
+                if directory == self.raw_dir:
+                    if os.path.isdir(path):
+                        self._watch_dirs[self._inotify.add_watch(path, self._watch_mask)] = path
+                        # Files copied in with the folder
+                        for filename in os.listdir(path):
+                            if filename.endswith(self.suffixes):
+                                self._queue(os.path.join(path, filename))
+                elif event.name.endswith(self.suffixes):
+                    self._queue(path)
+        else:
+            time.sleep(self.poll_interval)
+            for filepath, signature in self._scan().items():
+                if self._known.get(filepath) != signature:
+                    self._queue(filepath)
+
+    def _queue(self, filepath: str) -> None:
+        """Start or restart the debounce clock for a file"""
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            self._pending.pop(filepath, None)
+            return
+        pending = self._pending.get(filepath)
+        if pending is None or pending[:2] != (stat.st_size, stat.st_mtime):
+            self._pending[filepath] = (stat.st_size, stat.st_mtime, time.monotonic())
+
+    def ready_files(self) -> List[Tuple[str, str]]:
+        """Wait up to one poll interval and return (account_id, filepath) pairs ready to ingest"""
+        self._collect_changes()
+        ready = []
+        now = time.monotonic()
+        for filepath in list(self._pending):
+            # Re-stat so files still being written keep resetting the clock
+            self._queue(filepath)
+            pending = self._pending.get(filepath)
+            if pending is not None and now - pending[2] >= self.debounce:
+                del self._pending[filepath]
+                self._known[filepath] = pending[:2]
+                account_id = os.path.basename(os.path.dirname(filepath))
+                ready.append((account_id, filepath))
+        return ready